@@ -1,14 +1,30 @@
 from . import patterns
 from .interface import *
+from .buffer import *
+from .bus import *
 from .fcserver import *
+from .parallel import *
+from .pipeline import *
+from .pool import *
 from .opcutil import *
+from .recording import *
+from .scheduler import *
+from .timing import *
 
 pattern_names = patterns.__all__
 modifier_names = patterns.modifiers.__all__
 
 __all__ = (
     interface.__all__
+    + buffer.__all__
+    + bus.__all__
     + fcserver.__all__
+    + parallel.__all__
+    + pipeline.__all__
+    + pool.__all__
     + opcutil.__all__
+    + recording.__all__
+    + scheduler.__all__
+    + timing.__all__
     + ['patterns', 'pattern_names', 'modifier_names']
 )
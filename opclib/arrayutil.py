@@ -0,0 +1,131 @@
+"""
+Module for array-based Open Pixel Control utilities. This module provides
+NumPy versions of the list manipulation functions in :mod:`opclib.opcutil`
+which work on whole frames, or batches of frames, at once.
+
+The functions take anything :func:`numpy.asarray` accepts, such as a list of
+ColorData, and return arrays. The first axis is the one the corresponding list
+function works along, so a list of colors becomes an array of shape
+``(n, 3)``. The list functions in :mod:`opclib.opcutil` remain the reference
+for how each function behaves.
+
+NumPy is required to use this module (``pip install opclib[numpy]``).
+"""
+
+import numpy
+
+from typing import Any
+
+__all__ = [
+    'shift',
+    'even_spread',
+    'spread',
+    'rotate_left',
+    'rotate_right'
+]
+
+
+def shift(current: Any, goal: Any, p: Any) -> numpy.ndarray:
+    """
+    Shift colors towards others. ``current`` and ``goal`` broadcast against
+    each other, so a whole frame (or batch of frames) can be shifted towards a
+    single color.
+
+    ``p`` is lined up with the leading axes of the colors, so a batch of
+    frames of shape ``(frames, num_leds, 3)`` can be shifted by one amount per
+    frame with ``p`` of shape ``(frames,)``, or by one amount per pixel with
+    ``p`` of shape ``(frames, num_leds)``.
+
+    :param current: the starting colors, e.g. of shape ``(num_leds, 3)``
+    :param goal: the colors to shift towards
+    :param p: a value indicating how far to shift (0 => no shift,
+        1 => ``goal``), or an array of such values
+    :return: the shifted colors
+    """
+    current = numpy.asarray(current, dtype=numpy.float64)
+    goal = numpy.asarray(goal, dtype=numpy.float64)
+    p = numpy.asarray(p, dtype=numpy.float64)
+    ndim = numpy.broadcast(current, goal).ndim
+    if p.ndim < ndim:
+        # one value per color, so extend p over the remaining axes
+        p = p.reshape(p.shape + (1,) * (ndim - p.ndim))
+    return current + (goal - current) * p
+
+
+def even_spread(vals: Any, n: int) -> numpy.ndarray:
+    """
+    Spread out the values across a larger array in order as evenly as
+    possible. See :func:`opclib.opcutil.even_spread`.
+
+    :param vals: the values to spread, e.g. colors of shape ``(k, 3)``
+    :param n: the length of the array to create from the given values
+    :return: an array consisting of ``vals`` spread across ``n`` indices
+    :raises ValueError: if ``vals`` is empty or ``n`` is negative
+    """
+    vals = numpy.asarray(vals)
+    if len(vals) < 1:
+        raise ValueError('no values provided')
+    if n < 0:
+        raise ValueError('list length cannot be negative')
+
+    remainder = n % len(vals)
+    # a value gets one extra index if it is equal to one of the first
+    # ``remainder`` values, like ``val in extra_vals`` in the list version
+    matches = vals[:, None] == vals[None, :remainder]
+    width = int(numpy.prod(vals.shape[1:]))  # size of a single value
+    matches = matches.reshape(len(vals), remainder, width).all(axis=2)
+    extra = matches.any(axis=1)
+    counts = n // len(vals) + extra
+    return numpy.repeat(vals, counts, axis=0)
+
+
+def spread(vals: Any, seq_length: int, list_length: int) -> numpy.ndarray:
+    """
+    Spread out values across a certain number of indices using the specified
+    number of times to repeat each value, repeating if the end of ``vals`` is
+    reached. See :func:`opclib.opcutil.spread`.
+
+    :param vals: the values to spread, e.g. colors of shape ``(k, 3)``
+    :param seq_length: the length of each value sequence
+    :param list_length: the length of the array to create
+    :return: an array consisting of sequences of values in ``vals`` of length
+        ``seq_length`` each
+    :raises ValueError: if ``vals`` is empty, ``list_length`` is negative or
+        ``seq_length`` is not positive
+    """
+    vals = numpy.asarray(vals)
+    if len(vals) < 1:
+        raise ValueError('no values provided')
+    if list_length < 0:
+        raise ValueError('list length cannot be negative')
+    if seq_length < 1:
+        raise ValueError('sequence length must be positive')
+
+    indices = (numpy.arange(list_length) // seq_length) % len(vals)
+    return vals[indices]
+
+
+def rotate_left(a: Any, n: int, axis: int = 0) -> numpy.ndarray:
+    """
+    Generate a version of the given array rotated left.
+
+    :param a: the array to rotate
+    :param n: how many spaces to rotate the array
+    :param axis: the axis to rotate along; use 1 for a batch of frames of
+        shape ``(frames, num_leds, 3)``
+    :return: the rotated array
+    """
+    return numpy.roll(a, -n, axis=axis)
+
+
+def rotate_right(a: Any, n: int, axis: int = 0) -> numpy.ndarray:
+    """
+    Generate a version of the given array rotated right.
+
+    :param a: the array to rotate
+    :param n: how many spaces to rotate the array
+    :param axis: the axis to rotate along; use 1 for a batch of frames of
+        shape ``(frames, num_leds, 3)``
+    :return: the rotated array
+    """
+    return numpy.roll(a, n, axis=axis)
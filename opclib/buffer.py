@@ -0,0 +1,400 @@
+"""
+Module for compact frame storage. A :class:`~PixelBuffer` holds a frame of RGB
+pixels as contiguous bytes, laid out exactly as the data block of an Open Pixel
+Control message, so frames can be written in place and sent without any
+per-pixel conversion.
+"""
+
+import functools
+import struct
+
+from array import array
+from itertools import chain
+from typing import Any, Iterable, Iterator, List, Optional, Union
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from .opcutil import ColorData, even_spread, spread
+
+__all__ = ['PixelBuffer', 'PaletteFrame', 'lerp_frames', 'uniform_frame']
+
+
+HEADER_FORMAT = '>BBH'  # channel, command, length of data block
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+
+def _clamp(value: float) -> int:
+    return min(255, max(0, int(value)))
+
+
+def color_lut(brightness: float = 1.0, gamma: float = 1.0) -> Optional[bytes]:
+    """
+    Build a lookup table which applies brightness and gamma correction to a
+    color value.
+
+    Each value ``v`` maps to ``255 * brightness * (v / 255) ** gamma``, rounded
+    and clamped to 0-255.
+
+    :param brightness: the factor to scale colors by (1 is unchanged)
+    :param gamma: the gamma exponent (1 is unchanged)
+    :return: a 256-byte table for ``bytes.translate``, or None if the table
+        would not change anything
+    """
+    if brightness == 1 and gamma == 1:
+        return None
+    return bytes(min(255, max(0, round(255 * brightness * (v / 255) ** gamma)))
+                 for v in range(256))
+
+
+def encode_pixels(pixels, lut: bytes = None) -> bytes:
+    """
+    Convert a list of RGB 3-tuples to the bytes of an OPC data block.
+
+    Each value is rounded down to an integer and clamped to 0-255, but the
+    whole frame is converted in one batch rather than pixel by pixel. NumPy is
+    used when it is installed; otherwise the values are streamed into a single
+    bytes object.
+
+    :param pixels: the colors to encode
+    :param lut: (optional) a 256-byte table from :func:`color_lut` to pass
+        every clamped value through
+    :return: 3 bytes per pixel, in RGB order
+    """
+    if isinstance(pixels, PaletteFrame):
+        return pixels.encode(lut)
+    if isinstance(pixels, PixelBuffer):
+        data = pixels.tobytes()
+    elif numpy is not None and len(pixels):
+        values = numpy.asarray(pixels, dtype=numpy.float64).reshape(-1)
+        numpy.clip(values, 0, 255, out=values)
+        values = values.astype(numpy.uint8)
+        if lut:
+            # look up while still an array, rather than in a second pass
+            return numpy.frombuffer(lut, numpy.uint8)[values].tobytes()
+        return values.tobytes()
+    else:
+        data = bytes(map(_clamp, chain.from_iterable(pixels)))
+    return data.translate(lut) if lut else data
+
+
+class PixelBuffer:
+    """
+    A preallocated frame of RGB pixels backed by contiguous uint8 storage.
+
+    The storage reserves room for an OPC header ahead of the pixel data, so
+    :meth:`message` can hand the client a complete message without copying.
+    Individual pixels read back as ``(r, g, b)`` tuples, and assigning colors
+    clamps them the same way :func:`encode_pixels` does.
+    """
+    data: memoryview  # 3 bytes per pixel, in RGB order
+
+    def __init__(self, num_leds: int, pixels=None):
+        """
+        Initialize a new :class:`~PixelBuffer` with every pixel off.
+
+        :param num_leds: the number of pixels to allocate
+        :param pixels: (optional) initial colors to copy into the buffer
+        """
+        num_leds = max(0, num_leds)
+        self._message = memoryview(bytearray(HEADER_SIZE + 3 * num_leds))
+        self.data = self._message[HEADER_SIZE:]
+
+        if pixels is not None:
+            self[:] = pixels
+
+    @classmethod
+    def over(cls, buffer: Any, num_leds: int,
+             offset: int = 0) -> 'PixelBuffer':
+        """
+        Create a :class:`~PixelBuffer` backed by an existing buffer, without
+        copying. The header occupies the 4 bytes at ``offset`` and the pixel
+        data follows immediately after.
+
+        :param buffer: an object supporting the buffer protocol; a frame over
+            a read-only buffer cannot be modified
+        :param num_leds: the number of pixels in the frame
+        :param offset: the position of the header within ``buffer``
+        :return: a view of ``buffer`` as a frame
+        :raises ValueError: if ``buffer`` is too small
+        """
+        size = HEADER_SIZE + 3 * num_leds
+        view = memoryview(buffer).cast('B')[offset:offset + size]
+        if len(view) != size:
+            raise ValueError('buffer is too small for the requested frame')
+
+        frame = cls.__new__(cls)
+        frame._message = view
+        frame.data = view[HEADER_SIZE:]
+        return frame
+
+    def message(self, channel: int = 0, command: int = 0) -> memoryview:
+        """
+        Write an OPC header in front of the pixel data and return a view of
+        the complete message.
+
+        The header is only written if it differs from the one already there.
+        A read-only frame whose header differs is copied into a new message
+        instead, since its storage cannot be changed.
+
+        :param channel: the channel the message is addressed to
+        :param command: the OPC command (0 sets pixel colors)
+        :return: a view of the header and data, ready to send
+        """
+        header = struct.pack(HEADER_FORMAT, channel, command, len(self.data))
+        if self._message[:HEADER_SIZE] != header:
+            if self._message.readonly:
+                return memoryview(header + self.data)
+            self._message[:HEADER_SIZE] = header
+        return self._message
+
+    def fill(self, color: ColorData) -> None:
+        """
+        Set every pixel to the same color.
+
+        :param color: the color to fill the frame with
+        """
+        self.data[:] = bytes(_clamp(v) for v in color) * len(self)
+
+    def copy(self) -> 'PixelBuffer':
+        """
+        Create an independent copy of this frame.
+        """
+        frame = PixelBuffer(len(self))
+        frame.data[:] = self.data
+        return frame
+
+    def tobytes(self) -> bytes:
+        """
+        Get the pixel data as a bytes object.
+        """
+        return self.data.tobytes()
+
+    def tolist(self) -> List[ColorData]:
+        """
+        Get the pixels as a list of RGB 3-tuples.
+        """
+        return list(self)
+
+    def _bounds(self, key: slice):
+        start, stop, step = key.indices(len(self))
+        if step != 1:
+            raise ValueError('PixelBuffer slices must be contiguous')
+        return 3 * start, 3 * max(start, stop)
+
+    def __len__(self) -> int:
+        return len(self.data) // 3
+
+    def __getitem__(self, key: Union[int, slice]):
+        if isinstance(key, slice):
+            start, stop = self._bounds(key)
+            return [tuple(self.data[i:i + 3]) for i in range(start, stop, 3)]
+
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError('PixelBuffer index out of range')
+        return tuple(self.data[3 * key:3 * key + 3])
+
+    def __setitem__(self, key: Union[int, slice], value) -> None:
+        if isinstance(key, slice):
+            start, stop = self._bounds(key)
+            if isinstance(value, PixelBuffer):
+                self.data[start:stop] = value.data  # plain memcpy
+            else:
+                self.data[start:stop] = encode_pixels(value)
+            return
+
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError('PixelBuffer index out of range')
+        self.data[3 * key:3 * key + 3] = bytes(_clamp(v) for v in value)
+
+    def __iter__(self) -> Iterator[ColorData]:
+        data = self.data
+        return (tuple(data[i:i + 3]) for i in range(0, len(data), 3))
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, PixelBuffer):
+            return self.data == other.data
+        try:
+            return len(self) == len(other) and list(self) == list(other)
+        except TypeError:
+            return NotImplemented
+
+    def __reduce__(self):
+        # memoryviews cannot be pickled, so copy the message into new storage
+        return PixelBuffer.over, (bytearray(self._message), len(self))
+
+    def __repr__(self) -> str:
+        return f'<PixelBuffer num_leds={len(self)}>'
+
+
+class PaletteFrame:
+    """
+    A frame stored as one palette index per pixel plus a small palette of
+    colors.
+
+    Indices take one byte per pixel for palettes of up to 256 colors, and two
+    bytes otherwise. Changing a color in :attr:`palette` recolors every pixel
+    which uses it, and encoding looks each index up in the encoded palette in
+    a single batch.
+    """
+    palette: List[ColorData]  # colors the indices refer to
+    indices: Union[bytearray, array]  # palette index of each pixel
+
+    def __init__(self, indices: Iterable[int], palette: Iterable[ColorData]):
+        """
+        Initialize a new :class:`~PaletteFrame`.
+
+        :param indices: the palette index of each pixel
+        :param palette: the colors to index into
+        :raises ValueError: if an index is outside of the palette
+        """
+        self.palette = list(palette)
+        if len(self.palette) <= 256:
+            self.indices = bytearray(indices)
+        else:
+            self.indices = array('H', indices)
+
+        if self.indices and max(self.indices) >= len(self.palette):
+            raise ValueError('palette index out of range')
+
+    @classmethod
+    def from_colors(cls, pixels: Iterable[ColorData]) -> 'PaletteFrame':
+        """
+        Create a :class:`~PaletteFrame` from a list of colors, with one palette
+        entry per distinct color in order of first appearance.
+
+        :param pixels: the colors of the frame
+        :return: the palette-indexed frame
+        """
+        palette = {}
+        indices = [palette.setdefault(tuple(color), len(palette))
+                   for color in pixels]
+        return cls(indices, palette)
+
+    @classmethod
+    def spread(cls, colors: List[ColorData], width: Optional[int],
+               num_leds: int) -> 'PaletteFrame':
+        """
+        Create a :class:`~PaletteFrame` with ``colors`` spread across the
+        pixels, with ``colors`` as the palette.
+
+        :param colors: the colors to spread, in order
+        :param width: (optional) the number of pixels to give each color,
+            repeating the colors to fill the frame; by default the colors are
+            spread as evenly as possible
+        :param num_leds: the number of pixels
+        :return: the palette-indexed frame
+        """
+        # equal colors share an index, so spreading the indices lays them out
+        # exactly like spreading the colors themselves
+        indices = [colors.index(c) for c in colors]
+        if width:
+            indices = spread(indices, width, num_leds)
+        else:
+            indices = even_spread(indices, num_leds)
+        return cls(indices, colors)
+
+    def encode(self, lut: bytes = None) -> bytes:
+        """
+        Convert the frame to the bytes of an OPC data block.
+
+        :param lut: (optional) a 256-byte table from :func:`color_lut`, which
+            is only applied to the palette
+        :return: 3 bytes per pixel, in RGB order
+        """
+        colors = encode_pixels(self.palette, lut)
+        if numpy is not None and self.indices:
+            dtype = numpy.uint8 if isinstance(self.indices,
+                                              bytearray) else numpy.uint16
+            table = numpy.frombuffer(colors, numpy.uint8).reshape(-1, 3)
+            return table[numpy.frombuffer(self.indices, dtype)].tobytes()
+
+        if isinstance(self.indices, bytearray):
+            # look up each of red, green and blue with a translation table
+            data = bytearray(3 * len(self.indices))
+            for channel in range(3):
+                table = colors[channel::3].ljust(256, b'\0')
+                data[channel::3] = self.indices.translate(table)
+            return bytes(data)
+
+        return b''.join([colors[3 * i:3 * i + 3] for i in self.indices])
+
+    def to_buffer(self) -> PixelBuffer:
+        """
+        Expand the frame into a new :class:`~PixelBuffer`.
+        """
+        frame = PixelBuffer(len(self))
+        frame.data[:] = self.encode()
+        return frame
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __getitem__(self, key: int) -> ColorData:
+        return self.palette[self.indices[key]]
+
+    def __iter__(self) -> Iterator[ColorData]:
+        palette = self.palette
+        return (palette[i] for i in self.indices)
+
+    def __repr__(self) -> str:
+        return (f'<PaletteFrame num_leds={len(self)} '
+                f'colors={len(self.palette)}>')
+
+
+def uniform_frame(color: ColorData, num_leds: int) -> PixelBuffer:
+    """
+    Create a frame with every pixel set to the same color.
+
+    The pixel data is built by repeating the color's three bytes, and the
+    data of recently used frames is cached, so a repeated uniform frame costs
+    a single copy. Each call returns a new frame, which may be modified.
+
+    :param color: the color of every pixel
+    :param num_leds: the number of pixels
+    :return: the frame
+    """
+    num_leds = max(0, num_leds)
+    frame = PixelBuffer(num_leds)
+    frame.data[:] = _uniform_data(tuple(_clamp(v) for v in color), num_leds)
+    return frame
+
+
+@functools.lru_cache(maxsize=64)
+def _uniform_data(rgb, num_leds):
+    return bytes(rgb) * num_leds
+
+
+def lerp_frames(a: PixelBuffer, b: PixelBuffer, p: float) -> PixelBuffer:
+    """
+    Linearly interpolate between two frames of the same length.
+
+    With NumPy installed the whole frame is interpolated in one vectorized
+    operation; otherwise every value is interpolated in turn.
+
+    :param a: the frame to start from
+    :param b: the frame to move towards
+    :param p: how far to move (0 => ``a``, 1 => ``b``)
+    :return: a new frame, with values rounded down like :func:`encode_pixels`
+    :raises ValueError: if the frames differ in length
+    """
+    if len(a) != len(b):
+        raise ValueError('cannot interpolate between frames of different '
+                         'lengths')
+
+    frame = PixelBuffer(len(a))
+    if numpy is not None:
+        start = numpy.frombuffer(a.data, numpy.uint8).astype(numpy.float64)
+        end = numpy.frombuffer(b.data, numpy.uint8)
+        start += (end - start) * p
+        numpy.frombuffer(frame.data, numpy.uint8)[:] = start
+    else:
+        frame.data[:] = bytes(int(x + (y - x) * p)
+                              for x, y in zip(a.data, b.data))
+    return frame
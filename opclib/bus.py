@@ -0,0 +1,347 @@
+"""
+Module for rendering in several processes at once. A :class:`~FrameBus` is a
+block of shared memory with one slot per lighting configuration: worker
+processes each render a configuration into their own slot, and a single
+sender reads the newest frame of every slot and sends them all with one
+client. Frames are written straight into shared memory, so nothing is pickled
+per frame, and heavy patterns are not held back by one another under the GIL.
+
+Each slot is double-buffered and numbered by a sequence number. The writer
+of a slot fills whichever buffer is not holding the newest frame, and bumps
+the sequence number before and after doing so; a reader copies the buffer
+holding the newest frame. Each slot also has a lock, held by the writer only
+while it bumps the sequence number and by a reader while it copies, so the
+writer never starts on the buffer being read and a frame is never read while
+half written. The locks also order the reads and writes of the shared memory
+between processes, which plain stores to shared memory do not guarantee on
+every CPU (such as the ARM cores of a Raspberry Pi). Since writers fill the
+other buffer, they only wait for a reader to finish copying when they
+publish a frame.
+
+Shared memory requires Python 3.8 or later.
+"""
+
+import multiprocessing
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from .buffer import HEADER_SIZE, PixelBuffer, encode_pixels
+from .interface import DynamicLightConfig, LightConfig
+from .timing import FrameClock
+
+__all__ = ['FrameBus', 'run_bus']
+
+# the shared memory starts with 64-bit fields: the number of slots, the stop
+# flag, then the LEDs, sequence number, done flag and failed flag of each slot
+_SLOTS, _STOPPED = 0, 1
+_FIELDS_PER_SLOT = 4
+_NUM_LEDS, _SEQUENCE, _DONE, _FAILED = 0, 1, 2, 3
+
+
+class FrameBus:
+    """
+    Shared memory through which worker processes hand frames to a sender.
+
+    A bus is created in one process and passed to the others as an argument
+    of :class:`multiprocessing.Process`, which attaches them to the same
+    shared memory and locks. Only one process may write to each slot.
+    """
+    name: str  # the name of the shared memory block
+    num_leds: List[int]  # the number of LEDs in each slot
+
+    def __init__(self, num_leds: List[int], name: str = None):
+        """
+        Create a new :class:`~FrameBus`.
+
+        :param num_leds: the number of LEDs in each slot
+        :param name: (optional) the name to give the shared memory block
+        :raises ImportError: if shared memory is not available
+        """
+        if shared_memory is None:
+            raise ImportError('FrameBus requires Python 3.8 or later')
+
+        fields = 2 + _FIELDS_PER_SLOT * len(num_leds)
+        size = 8 * fields + sum(2 * (HEADER_SIZE + 3 * n) for n in num_leds)
+        self._memory = shared_memory.SharedMemory(name, create=True,
+                                                  size=size)
+        self._setup(num_leds, [multiprocessing.Lock() for _ in num_leds])
+        self._fields[_SLOTS] = len(num_leds)
+        for slot, n in enumerate(num_leds):
+            self._fields[self._field(slot, _NUM_LEDS)] = n
+
+    @classmethod
+    def attach(cls, name: str, locks: List[Any]) -> 'FrameBus':
+        """
+        Attach to a bus created by another process.
+
+        :param name: the name of the bus
+        :param locks: the locks of the bus's slots, inherited from the process
+            which created it
+        :return: the bus
+        """
+        bus = cls.__new__(cls)
+        bus._memory = shared_memory.SharedMemory(name)
+        fields = bus._memory.buf[:8].cast('Q')
+        slots = fields[_SLOTS]
+        fields.release()
+        fields = bus._memory.buf[:8 * (2 + _FIELDS_PER_SLOT * slots)].cast('Q')
+        num_leds = [fields[2 + _FIELDS_PER_SLOT * slot + _NUM_LEDS]
+                    for slot in range(slots)]
+        fields.release()
+        bus._setup(num_leds, locks)
+        return bus
+
+    def _setup(self, num_leds: List[int], locks: List[Any]) -> None:
+        self.name = self._memory.name
+        self.num_leds = list(num_leds)
+        self._locks = locks
+
+        header = 8 * (2 + _FIELDS_PER_SLOT * len(num_leds))
+        self._fields = self._memory.buf[:header].cast('Q')
+
+        # each slot's two buffers, as frames over the shared memory
+        self._buffers = []
+        offset = header
+        for n in num_leds:
+            size = HEADER_SIZE + 3 * n
+            self._buffers.append((
+                PixelBuffer.over(self._memory.buf, n, offset),
+                PixelBuffer.over(self._memory.buf, n, offset + size)))
+            offset += 2 * size
+
+    def _field(self, slot: int, field: int) -> int:
+        return 2 + _FIELDS_PER_SLOT * slot + field
+
+    @property
+    def stopped(self) -> bool:
+        """
+        Whether :meth:`stop` has been called by any process.
+        """
+        return bool(self._fields[_STOPPED])
+
+    def stop(self) -> None:
+        """
+        Tell every process using the bus to stop rendering and sending.
+        """
+        self._fields[_STOPPED] = 1
+
+    def done(self, slot: int) -> bool:
+        """
+        Whether the writer of a slot has finished without an error.
+
+        :param slot: the slot to check
+        """
+        return bool(self._fields[self._field(slot, _DONE)])
+
+    def failed(self, slot: int) -> bool:
+        """
+        Whether the writer of a slot has stopped because of an error.
+
+        :param slot: the slot to check
+        """
+        return bool(self._fields[self._field(slot, _FAILED)])
+
+    def sequence(self, slot: int) -> int:
+        """
+        Get the number of the newest complete frame in a slot (0 if none has
+        been written).
+
+        :param slot: the slot to check
+        """
+        return self._fields[self._field(slot, _SEQUENCE)] // 2
+
+    def write(self, slot: int, pixels) -> int:
+        """
+        Publish a frame to a slot.
+
+        :param slot: the slot to write to
+        :param pixels: the colors to write, as accepted by
+            :meth:`opc.Client.put_pixels`
+        :return: the number of the frame written
+        """
+        field = self._field(slot, _SEQUENCE)
+        lock = self._locks[slot]
+        data = pixels.data if isinstance(pixels, PixelBuffer) \
+            else encode_pixels(pixels)
+
+        with lock:
+            sequence = self._fields[field] + 1  # odd while writing
+            self._fields[field] = sequence
+        frame = (sequence + 1) // 2
+        # readers only copy the newest frame, which is in the other buffer
+        self._buffers[slot][frame % 2].data[:] = data
+        with lock:
+            self._fields[field] = sequence + 1
+        return frame
+
+    def read(self, slot: int,
+             out: PixelBuffer = None) -> Tuple[int, PixelBuffer]:
+        """
+        Copy the newest complete frame out of a slot.
+
+        :param slot: the slot to read from
+        :param out: (optional) the frame to copy into, if not a new one
+        :return: the number of the frame read, and the frame
+        """
+        if out is None:
+            out = PixelBuffer(self.num_leds[slot])
+        with self._locks[slot]:
+            # the writer cannot move on to this buffer until the lock is free
+            frame = self._fields[self._field(slot, _SEQUENCE)] // 2
+            out.data[:] = self._buffers[slot][frame % 2].data
+        return frame, out
+
+    def render(self, slot: int, config: LightConfig) -> None:
+        """
+        Render a lighting configuration into a slot at its own speed, until
+        it runs out of frames or the bus is stopped. Static configurations
+        are written once. Meant to be the target of a worker process.
+
+        The slot is marked done when rendering ends normally, or failed if
+        the configuration raised an error, which is then raised again.
+
+        :param slot: the slot to write to
+        :param config: the lighting configuration to render
+        """
+        try:
+            if isinstance(config, DynamicLightConfig):
+                clock = FrameClock(config.speed)
+                while not self.stopped:
+                    skipped = clock.tick()
+                    if skipped:
+                        config.catch_up(skipped)
+                    self.write(slot, next(config))
+            else:
+                self.write(slot, next(config))
+        except StopIteration:
+            pass  # a finite configuration has ended
+        except BaseException:
+            self._fields[self._field(slot, _FAILED)] = 1
+            raise
+        self._fields[self._field(slot, _DONE)] = 1
+
+    def send(self, client, rate: float, channels: Dict[int, int] = None,
+             workers: List[multiprocessing.Process] = None) -> None:
+        """
+        Send the newest frame of every slot whenever it changes, until every
+        slot is done or the bus is stopped.
+
+        :param client: the client to send frames with. Frames for several
+            channels are sent together with ``put_frames`` if the client has
+            it, like :class:`opc.Client`; otherwise each is sent with
+            ``put_pixels``, like :class:`~opclib.pool.ClientPool`.
+        :param rate: the number of times per second to check for new frames
+        :param channels: (optional) the channel to send each slot to, if not
+            the slot number plus 1
+        :param workers: (optional) the process writing to each slot, to watch
+            for processes which exit without finishing their slot
+        :raises RuntimeError: if the writer of a slot fails, or a worker
+            process exits without finishing its slot
+        """
+        slots = range(len(self.num_leds))
+        if channels is None:
+            channels = {slot: slot + 1 for slot in slots}
+        frames = [PixelBuffer(n) for n in self.num_leds]
+        sent = [0] * len(frames)
+
+        clock = FrameClock(rate)
+        while not self.stopped:
+            clock.tick()
+            for slot in slots:
+                if self.failed(slot):
+                    raise RuntimeError(f'writer of slot {slot} failed')
+            if workers:
+                self._check_workers(workers)
+            finished = all(self.done(slot) for slot in slots)
+            changed = {}
+            for slot in slots:
+                if self.sequence(slot) != sent[slot]:
+                    sent[slot], frame = self.read(slot, frames[slot])
+                    changed[channels[slot]] = frame
+            if changed and hasattr(client, 'put_frames'):
+                client.put_frames(changed)
+            else:
+                for channel, frame in changed.items():
+                    client.put_pixels(frame, channel)
+            if finished:
+                return  # every frame written has been sent
+
+    def _check_workers(self, workers: List[multiprocessing.Process]) -> None:
+        for slot, worker in enumerate(workers):
+            code = worker.exitcode
+            if code is not None and (code != 0 or not self.done(slot)):
+                raise RuntimeError(f'worker for slot {slot} exited with code '
+                                   f'{code}')
+
+    def close(self) -> None:
+        """
+        Detach from the bus. Frames read earlier remain usable.
+        """
+        self._buffers = []
+        self._locks = []
+        self._fields.release()
+        self._memory.close()
+
+    def unlink(self) -> None:
+        """
+        Free the shared memory once every process has closed the bus. Called
+        by the process which created it.
+        """
+        self._memory.unlink()
+
+    def __reduce__(self):
+        # other processes attach to the same memory rather than copying it;
+        # like any lock, the slots' locks can only be passed to a new process
+        return FrameBus.attach, (self.name, self._locks)
+
+    def __repr__(self):
+        return f'<FrameBus {self.name} slots={len(self.num_leds)}>'
+
+
+def run_bus(configs: List[LightConfig], client,
+            channels: Dict[int, int] = None,
+            rate: Optional[float] = None) -> None:
+    """
+    Render each lighting configuration in its own process and send them all
+    from this one, through a :class:`~FrameBus`.
+
+    :param configs: the lighting configurations to run; they must be
+        picklable
+    :param client: the client to send frames with, such as an
+        :class:`opc.Client`
+    :param channels: (optional) the channel to send each configuration to, by
+        position in ``configs``, if not its position plus 1
+    :param rate: (optional) the number of times per second to send new
+        frames, if not the speed of the fastest configuration
+    :raises RuntimeError: if a worker process fails
+    """
+    if rate is None:
+        rate = max((c.speed for c in configs
+                    if isinstance(c, DynamicLightConfig)), default=10)
+
+    bus = FrameBus([config.num_leds for config in configs])
+    workers = [multiprocessing.Process(target=bus.render, args=(slot, config),
+                                       daemon=True)
+               for slot, config in enumerate(configs)]
+    try:
+        for worker in workers:
+            worker.start()
+        bus.send(client, rate, channels, workers)
+    finally:
+        bus.stop()
+        for worker in workers:
+            worker.join()
+        codes = [worker.exitcode for worker in workers]
+        bus.close()
+        bus.unlink()
+
+    # a worker may also have failed after finishing its slot
+    for slot, code in enumerate(codes):
+        if code:
+            raise RuntimeError(f'worker for slot {slot} exited with code '
+                               f'{code}')
@@ -1,8 +1,17 @@
 import abc
-import time
+import threading
 
 from typing import List, Iterator
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 from . import opc
+from .buffer import PixelBuffer, encode_pixels
+from .pipeline import FrameQueue
+from .timing import FrameClock
 from .opcutil import ColorData, ColorHex, is_color, is_color_list
 
 __all__ = ['LightConfig', 'DynamicLightConfig', 'StaticLightConfig']
@@ -13,12 +22,25 @@ __all__ = ['LightConfig', 'DynamicLightConfig', 'StaticLightConfig']
 # the work of pushing the generated list to the Fadecandy client.
 
 
-# TODO: Add ability to control brightness
+def require_numpy(feature: str) -> None:
+    """
+    Ensure that NumPy is installed before using a feature which needs it.
+
+    :param feature: the name of the feature, for the error message
+    :raises ImportError: if NumPy is not installed
+    """
+    if numpy is None:
+        raise ImportError(f'{feature} requires NumPy '
+                          f'(pip install opclib[numpy])')
+
+
 class LightConfig(abc.ABC):
     """
     Abstract base class for an LED lighting configuration.
     """
     client: opc.Client
+    seekable: bool = False  # whether render_frame is supported
+    period: int = None  # number of frames after which the pattern repeats
 
     def __init__(self, num_leds: int = 512, **kwargs):
         """
@@ -40,24 +62,89 @@ class LightConfig(abc.ABC):
         Get the next list of colors to push to the Fadecandy client.
         """
 
+    def render_frame(self, index: int) -> List[ColorData]:
+        """
+        Compute a frame of this lighting configuration directly, without
+        rendering the frames before it or changing which frame :meth:`__next__`
+        returns. Only supported by configurations which are :attr:`seekable`.
+
+        :param index: the number of the frame to render (0 is the frame before
+            the first call to :meth:`__next__`)
+        :return: a list of RGB values to display
+        :raises NotImplementedError: if frames can only be rendered in order
+        """
+        raise NotImplementedError(f'{type(self).__name__} can only render '
+                                  f'frames in order')
+
+    def frame_at(self, t: float) -> int:
+        """
+        Get the number of the frame displayed ``t`` seconds after the start.
+
+        :param t: the time in seconds
+        :return: the frame number
+        """
+        return 0
+
+    def render(self, t: float) -> List[ColorData]:
+        """
+        Compute the frame displayed ``t`` seconds after the start, without
+        changing which frame :meth:`__next__` returns.
+
+        :param t: the time in seconds
+        :return: a list of RGB values to display
+        :raises NotImplementedError: if frames can only be rendered in order
+        """
+        return self.render_frame(self.frame_at(t))
+
+    def render_batch(self, n: int) -> 'numpy.ndarray':
+        """
+        Get the next ``n`` frames at once, as if by calling :meth:`__next__`
+        ``n`` times. Patterns which can compute many frames in one vectorized
+        operation override this to avoid rendering frame by frame.
+
+        NumPy is required to use this method (``pip install opclib[numpy]``).
+
+        :param n: the number of frames to render
+        :return: a uint8 array of shape ``(n, num_leds, 3)``, with fewer than
+            ``n`` frames if the configuration runs out of frames
+        :raises ImportError: if NumPy is not installed
+        """
+        require_numpy('render_batch')
+        batch = numpy.empty((n, self.num_leds, 3), numpy.uint8)
+        rows = batch.reshape(n, -1)
+        for i in range(n):
+            try:
+                rows[i] = numpy.frombuffer(encode_pixels(next(self)),
+                                           numpy.uint8)
+            except StopIteration:
+                return batch[:i]
+        return batch
+
     @abc.abstractmethod
-    def run(self, host: str = 'localhost', port: int = 7890) -> None:
+    def run(self, host: str = 'localhost', port: int = 7890,
+            client: opc.Client = None) -> None:
         """
         Run this lighting configuration.
 
         :param host: hostname or IP address of Fadecandy server
         :param port: port that the Fadecandy server is running on
+        :param client: (optional) the client to send pixels with, such as a
+            :class:`~opclib.pool.ClientPool`; overrides ``host`` and ``port``
         """
-        self.client = opc.Client(f'{host}:{port}')
+        self.client = client or opc.Client(f'{host}:{port}')
 
     @staticmethod
-    def factory(pattern: str, strobe: bool = False, **kwargs) -> 'LightConfig':
+    def factory(pattern: str, strobe: bool = False, cache: bool = False,
+                interpolate: float = None, **kwargs) -> 'LightConfig':
         """
         Generate a :class:`~LightConfig` based on keywaord arguments. Different
         patterns differ in required keyword arguments.
 
         :param pattern: the name of the desired lighting configuration
         :param strobe: whether to add a strobe effect
+        :param cache: whether to replay repeating frames from memory
+        :param interpolate: (optional) the frame rate to output at, blending
+            between the frames of the pattern
         :param kwargs: keyword arguments to pass to LightConfig constructor
         :return: an instance of the class associated with ``pattern``
         :raises ValueError: if ``pattern`` is not associated with any patterns
@@ -74,6 +161,10 @@ class LightConfig(abc.ABC):
 
         if strobe:
             light = patterns.modifiers.Strobe(light)
+        if cache and isinstance(light, DynamicLightConfig):
+            light = patterns.modifiers.Cache(light)
+        if interpolate and isinstance(light, DynamicLightConfig):
+            light = patterns.modifiers.Interpolate(light, interpolate)
 
         return light
 
@@ -115,14 +206,63 @@ class LightConfig(abc.ABC):
 class StaticLightConfig(LightConfig, abc.ABC):
     """
     A lighting configuration that displays an unmoving pattern.
+
+    The pattern is rendered and encoded once, then reused until
+    :meth:`cache_key` changes. Every frame handed out is a copy of the
+    encoded pattern, so frames may be modified without affecting the pattern.
     """
+    seekable = True
+    period = 1
 
-    def __next__(self):
-        return self.pattern()
+    _data: bytes = None  # the encoded pattern
+    _data_key = None  # cache_key() when _data was rendered
 
-    def run(self, host: str = 'localhost', port: int = 7890) -> None:
-        super().run(host, port)  # initialize client
-        self.client.put_pixels(self.pattern())  # set pixels
+    def __next__(self) -> PixelBuffer:
+        return self.frame()
+
+    def render_frame(self, index: int) -> PixelBuffer:
+        return self.frame()
+
+    def render_batch(self, n: int) -> 'numpy.ndarray':
+        # every frame is the same, so encode it once and repeat it
+        require_numpy('render_batch')
+        self.frame()  # render the pattern if it has changed
+        frame = numpy.frombuffer(self._data, numpy.uint8)
+        return numpy.tile(frame.reshape(1, -1, 3), (n, 1, 1))
+
+    def run(self, host: str = 'localhost', port: int = 7890,
+            client: opc.Client = None) -> None:
+        super().run(host, port, client)  # initialize client
+        self.client.put_pixels(self.frame())  # set pixels
+
+    def frame(self) -> PixelBuffer:
+        """
+        Get the pattern as an encoded frame. Each call returns a new frame,
+        copied from the encoded pattern.
+
+        :return: the encoded pattern
+        """
+        key = self.cache_key()
+        if self._data is None or key is None or key != self._data_key:
+            self._data = self.encode_pattern().tobytes()
+            self._data_key = key
+        frame = PixelBuffer(len(self._data) // 3)
+        frame.data[:] = self._data
+        return frame
+
+    def cache_key(self):
+        """
+        Get a value which changes whenever the pattern would, such as a tuple
+        of the configuration's parameters. If None is returned (the default),
+        the pattern is rendered every time it is needed.
+        """
+        return None
+
+    def encode_pattern(self) -> PixelBuffer:
+        """
+        Render the pattern into a new :class:`~PixelBuffer`.
+        """
+        return PixelBuffer(self.num_leds, self.pattern())
 
     @abc.abstractmethod
     def pattern(self) -> List[ColorData]:
@@ -135,8 +275,24 @@ class StaticLightConfig(LightConfig, abc.ABC):
 class DynamicLightConfig(LightConfig, abc.ABC):
     """
     A lighting configuration that displays a moving pattern.
+
+    Subclasses either implement :meth:`render_frame`, which makes them
+    :attr:`seekable`, or override :meth:`__next__` to step through their
+    frames in order.
     """
     speed: float
+    frame_index: int = 0  # number of the most recently returned frame
+    clock: FrameClock  # frame timing of the current run
+    frame_queue: FrameQueue = None  # render-to-send queue of a pipelined run
+
+    def __new__(cls, *args, **kwargs):
+        # __next__ and render_frame are defined in terms of each other, so
+        # neither can be abstract; require at least one to be overridden
+        if (cls.__next__ is DynamicLightConfig.__next__
+                and cls.render_frame is LightConfig.render_frame):
+            raise TypeError(f"Can't instantiate {cls.__name__} without an "
+                            f"implementation of __next__ or render_frame")
+        return super().__new__(cls)
 
     def __init__(self, speed: int = None, **kwargs):
         """
@@ -148,9 +304,132 @@ class DynamicLightConfig(LightConfig, abc.ABC):
         if speed:
             self.speed = speed
 
-    def run(self, host: str = 'localhost', port: int = 7890) -> None:
-        super().run(host, port)  # initialize client
+    def run(self, host: str = 'localhost', port: int = 7890,
+            client: opc.Client = None, pipeline: str = None,
+            queue_size: int = 2, clock: FrameClock = None) -> None:
+        """
+        Run this lighting configuration.
+
+        By default each frame is rendered and then sent before the next one is
+        rendered. If ``pipeline`` is given, frames are rendered in a background
+        thread and handed to the sender through a
+        :class:`~opclib.pipeline.FrameQueue` with that overflow policy, so
+        network hiccups do not stall rendering.
+
+        :param host: hostname or IP address of Fadecandy server
+        :param port: port that the Fadecandy server is running on
+        :param client: (optional) the client to send pixels with
+        :param pipeline: (optional) the :class:`~opclib.pipeline.FrameQueue`
+            policy to run with: ``'block'``, ``'drop-oldest'`` or ``'latest'``
+        :param queue_size: the number of frames the pipeline can hold
+        :param clock: (optional) the :class:`~opclib.timing.FrameClock` to
+            pace the frames with, if not one at :attr:`speed`
+        """
+        super().run(host, port, client)  # initialize client
+        self.clock = clock or FrameClock(self.speed)
+        if pipeline:
+            self.frame_queue = FrameQueue(queue_size, pipeline)
+            self._run_pipelined()
+            return
+
         while True:
-            pixels = next(self)
+            try:
+                pixels = self._next_on_time()
+            except StopIteration:
+                return  # a finite configuration has ended
             self.client.put_pixels(pixels)
-            time.sleep(1 / self.speed)
+
+    def _next_on_time(self) -> List[ColorData]:
+        skipped = self.clock.tick()
+        if skipped:
+            self.catch_up(skipped)
+        return next(self)
+
+    def _run_pipelined(self) -> None:
+        frames = self.frame_queue
+        failure = []  # an exception raised by the render stage
+
+        def render():
+            try:
+                while True:
+                    pixels = self._next_on_time()
+                    if isinstance(pixels, PixelBuffer):
+                        pixels = pixels.copy()  # may be reused by the config
+                    frames.put(pixels)
+            except StopIteration:
+                pass  # a finite configuration has ended
+            except BaseException as e:
+                failure.append(e)  # raised again by the sender
+            finally:
+                frames.close()
+
+        threading.Thread(target=render, daemon=True).start()
+        while True:
+            pixels = frames.get()
+            if pixels is None:
+                break  # the render stage has stopped
+            self.client.put_pixels(pixels)
+        if failure:
+            raise failure[0]
+
+    def __next__(self) -> List[ColorData]:
+        self.frame_index += 1
+        return self.render_frame(self.frame_index)
+
+    def frame_at(self, t: float) -> int:
+        return int(t * self.speed)
+
+    def batch_indices(self, n: int) -> 'numpy.ndarray':
+        """
+        Advance past the next ``n`` frames and get their numbers, for use by
+        vectorized implementations of :meth:`render_batch`.
+
+        :param n: the number of frames in the batch
+        :return: an array of the frame numbers
+        :raises ImportError: if NumPy is not installed
+        """
+        require_numpy('render_batch')
+        indices = numpy.arange(self.frame_index + 1, self.frame_index + n + 1)
+        self.frame_index += n
+        return indices
+
+    def seek(self, index: int) -> None:
+        """
+        Jump to a frame, so that it is the one returned by the next call to
+        :meth:`__next__`. Only supported by :attr:`seekable` configurations.
+
+        :param index: the number of the frame to jump to
+        :raises NotImplementedError: if frames can only be rendered in order
+        """
+        if not self.seekable:
+            raise NotImplementedError(f'{type(self).__name__} can only '
+                                      f'render frames in order')
+        self.frame_index = index - 1
+
+    def skip(self, n: int) -> None:
+        """
+        Advance this lighting configuration by ``n`` frames without displaying
+        them. Called by :meth:`run` when frames are missed.
+
+        :param n: the number of frames to skip
+        """
+        if self.seekable:
+            self.frame_index += n
+            return
+        for _ in range(n):
+            next(self)
+
+    def catch_up(self, missed: int) -> None:
+        """
+        Account for ``missed`` frame deadlines which passed while the previous
+        frame was being rendered or sent.
+
+        A :attr:`seekable` configuration skips the missed frames, so that it
+        stays on schedule. Any other configuration coalesces them: the next
+        frame rendered is simply the next one in order, since rendering the
+        missed frames only to throw them away would put it further behind.
+
+        :param missed: the number of deadlines missed
+        """
+        if self.seekable:
+            self.skip(missed)
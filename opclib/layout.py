@@ -0,0 +1,142 @@
+"""
+Module for physical LED layouts. A :class:`~Layout` holds the position of
+every LED in wiring order, as loaded from an OPC layout file (the JSON format
+used by the Fadecandy and Open Pixel Control tools) or generated for a grid.
+
+Coordinates are precomputed as arrays when the layout is created, so patterns
+such as :class:`opclib.patterns.Field` can compute a color for every LED at
+once.
+
+NumPy is required to use this module (``pip install opclib[numpy]``).
+"""
+
+import json
+
+import numpy
+
+from typing import Any, IO, Union
+
+__all__ = ['Layout', 'grid_order']
+
+
+def grid_order(width: int, height: int,
+               serpentine: bool = False) -> numpy.ndarray:
+    """
+    Find the position in a grid of each LED of a matrix wired row by row.
+
+    Indexing a row-major image of the grid with the result puts its pixels in
+    wiring order, e.g. ``image.reshape(-1, 3)[grid_order(w, h)]`` for an image
+    of shape ``(h, w, 3)``.
+
+    :param width: the number of LEDs in each row
+    :param height: the number of rows
+    :param serpentine: whether every other row is wired right to left
+    :return: the row-major index into the grid of each LED
+    :raises ValueError: if ``width`` or ``height`` is negative
+    """
+    if width < 0 or height < 0:
+        raise ValueError('grid dimensions cannot be negative')
+
+    order = numpy.arange(width * height).reshape(height, width)
+    if serpentine:
+        order[1::2] = order[1::2, ::-1]
+    return order.reshape(-1)
+
+
+class Layout:
+    """
+    The positions of a set of LEDs, in the order they are wired.
+
+    ``x``, ``y`` and ``z`` are read-only arrays with one coordinate per LED.
+    """
+    points: numpy.ndarray  # (num_leds, 3) coordinates
+    x: numpy.ndarray
+    y: numpy.ndarray
+    z: numpy.ndarray
+
+    def __init__(self, points: Any):
+        """
+        Initialize a new :class:`~Layout`.
+
+        :param points: the ``(x, y, z)`` or ``(x, y)`` position of each LED
+        :raises ValueError: if the points are not all 2D or all 3D
+        """
+        points = numpy.array(points, dtype=numpy.float64)
+        if not points.size:
+            points = numpy.zeros((0, 3))
+        if points.ndim != 2 or points.shape[1] not in (2, 3):
+            raise ValueError('points must have 2 or 3 coordinates')
+        if points.shape[1] == 2:
+            points = numpy.hstack([points, numpy.zeros((len(points), 1))])
+
+        points.flags.writeable = False
+        self.points = points
+        self.x, self.y, self.z = points.T
+
+    @classmethod
+    def load(cls, file: Union[str, IO]) -> 'Layout':
+        """
+        Load an OPC layout file: a JSON list of objects with a ``"point"``
+        entry for each LED.
+
+        :param file: the path of the file, or an open file
+        :return: the layout described by the file
+        :raises ValueError: if an entry has no ``"point"``
+        """
+        if isinstance(file, str):
+            with open(file) as f:
+                entries = json.load(f)
+        else:
+            entries = json.load(file)
+
+        points = []
+        for i, entry in enumerate(entries):
+            if not isinstance(entry, dict) or 'point' not in entry:
+                raise ValueError(f'layout entry {i} has no point')
+            points.append(entry['point'])
+        return cls(points)
+
+    @classmethod
+    def grid(cls, width: int, height: int, serpentine: bool = False,
+             spacing: float = 1.0) -> 'Layout':
+        """
+        Create the layout of a matrix wired row by row, starting at the
+        origin and counting up in x and y.
+
+        :param width: the number of LEDs in each row
+        :param height: the number of rows
+        :param serpentine: whether every other row is wired right to left
+        :param spacing: the distance between neighbouring LEDs
+        :return: the layout of the matrix
+        """
+        order = grid_order(width, height, serpentine)
+        return cls(numpy.stack([order % max(width, 1), order // max(width, 1)],
+                               axis=1) * spacing)
+
+    def normalized(self) -> 'Layout':
+        """
+        Scale and move this layout to fit between 0 and 1 on every axis,
+        keeping its proportions.
+
+        :return: the normalized layout
+        """
+        if not len(self):
+            return self
+        points = self.points - self.points.min(axis=0)
+        extent = points.max()
+        return Layout(points / extent if extent else points)
+
+    def reorder(self, order: Any) -> 'Layout':
+        """
+        Create a layout of the same LEDs wired in a different order.
+
+        :param order: for each LED of the new layout, its index in this one
+        :return: the reordered layout
+        """
+        return Layout(self.points[numpy.asarray(order)])
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def __repr__(self):
+        return f'<Layout num_leds={len(self)}>'
@@ -33,14 +33,84 @@ Recommended use:
 
 """
 
+import asyncio
 import socket
 import struct
-import sys
+import time
+
+from .buffer import (HEADER_FORMAT, HEADER_SIZE, PixelBuffer, color_lut,
+                     encode_pixels)
+
+
+def pack_header(channel, command, length):
+    """Build the 4-byte OPC header for a message with a data block of the
+    given length."""
+    return struct.pack(HEADER_FORMAT, channel, command, length)
+
+
+def pixel_message(pixels, channel=0, lut=None):
+    """Build the OPC message which sets the pixel colors on a channel.
+
+    A PixelBuffer is turned into a message in place; anything else is encoded
+    into a new bytes object.  If lut (a table from color_lut) is given, every
+    value is passed through it, which always means encoding a new message.
+
+    """
+    command = 0  # set pixel colors from openpixelcontrol.org
+    if isinstance(pixels, PixelBuffer) and not lut:
+        return pixels.message(channel, command)
+    data = encode_pixels(pixels, lut)
+    return pack_header(channel, command, len(data)) + data
+
+
+def frame_messages(frames, lut=None):
+    """Build the OPC messages for several channels as a list of buffers.
+
+    frames maps channel numbers to pixels, as accepted by put_pixels.  The
+    result alternates 4-byte headers and data blocks and can be written out
+    with a single scatter/gather send.  Pixels which appear on more than one
+    channel (the same object) are encoded once and the data block is shared,
+    so mirroring a frame to many channels only costs one header per channel.
+    If lut (a table from color_lut) is given, every value is passed through it.
+
+    """
+    command = 0  # set pixel colors from openpixelcontrol.org
+    encoded = {}
+    parts = []
+    for channel, pixels in frames.items():
+        data = encoded.get(id(pixels))
+        if data is None:
+            if isinstance(pixels, PixelBuffer) and not lut:
+                data = pixels.data
+            else:
+                data = encode_pixels(pixels, lut)
+            encoded[id(pixels)] = data
+        parts.append(pack_header(channel, command, len(data)))
+        parts.append(data)
+    return parts
+
+
+def interpolation_message(enabled=True):
+    """Build the Fadecandy firmware configuration message which enables or
+    disables frame interpolation."""
+    #build firmaware configuration message as documented on
+    #https://github.com/scanlime/fadecandy/blob/master/doc/fc_protocol_opc.md#set-firmware-configuration
+    if enabled:
+        config_bit = 0
+    else:
+        config_bit = 2
+    return struct.pack('BBBBBBBBB', 0, 255, 0, 5, 0, 1, 0, 2, config_bit)
+
+
+_MAX_SEND_PARTS = 1024  # most systems' IOV_MAX
 
 
 class Client(object):
 
-    def __init__(self, server_ip_port, long_connection=True, verbose=False):
+    def __init__(self, server_ip_port, long_connection=True, verbose=False,
+                 connect_timeout=1.0, min_backoff=0.1, max_backoff=5.0,
+                 suppress_duplicates=False, keepalive=1.0,
+                 brightness=1.0, gamma=1.0):
         """Create an OPC client object which sends pixels to an OPC server.
 
         server_ip_port should be an ip:port or hostname:port as a single string.
@@ -59,25 +129,94 @@ class Client(object):
         A connection is not established during __init__.  To check if a
         connection will succeed, use can_connect().
 
+        Connection attempts give up after connect_timeout seconds.  After a
+        failed attempt, no new attempt is made for min_backoff seconds, and
+        the wait doubles with every further failure up to max_backoff.  While
+        waiting, put_pixels drops frames immediately instead of connecting,
+        so an unreachable server costs the render loop almost nothing.  The
+        dropped_frames and reconnect_attempts counters record how often this
+        happens.
+
+        If suppress_duplicates is True, a frame identical to the last one sent
+        on the same channel is not sent again, unless keepalive seconds have
+        passed since it was.  Skipped frames count as successfully sent, and
+        are recorded by the suppressed_frames and suppressed_bytes counters.
+
+        brightness scales every color value sent (1.0 is unchanged) and gamma
+        applies gamma correction.  Both are applied through a 256-entry lookup
+        table while frames are encoded, and can be changed at any time through
+        the brightness and gamma attributes.
+
         If verbose is True, the client will print debugging info to the console.
 
         """
         self.verbose = verbose
 
         self._long_connection = long_connection
+        self._connect_timeout = connect_timeout
+        self._min_backoff = min_backoff
+        self._max_backoff = max_backoff
 
         self._ip, self._port = server_ip_port.split(':')
         self._port = int(self._port)
 
         self._socket = None  # will be None when we're not connected
+        self._backoff = 0  # seconds to wait after the next failed attempt
+        self._retry_at = 0  # time.monotonic() before which we won't connect
+
+        self._suppress_duplicates = suppress_duplicates
+        self._keepalive = keepalive
+        self._last_sent = {}  # channel -> (data, time.monotonic() when sent)
+
+        self._brightness = brightness
+        self._gamma = gamma
+        self._lut = color_lut(brightness, gamma)
+
+        self.dropped_frames = 0  # frames which were not sent
+        self.reconnect_attempts = 0  # failed connection attempts
+        self.suppressed_frames = 0  # duplicate frames which were not sent
+        self.suppressed_bytes = 0  # size of the messages not sent
 
     def _debug(self, m):
         if self.verbose:
             print('    %s' % str(m))
 
-    def _ensure_connected(self):
+    @property
+    def brightness(self):
+        """The factor every color value is scaled by."""
+        return self._brightness
+
+    @brightness.setter
+    def brightness(self, value):
+        self._brightness = value
+        self._lut = color_lut(self._brightness, self._gamma)
+
+    @property
+    def gamma(self):
+        """The gamma correction exponent applied to every color value."""
+        return self._gamma
+
+    @gamma.setter
+    def gamma(self, value):
+        self._gamma = value
+        self._lut = color_lut(self._brightness, self._gamma)
+
+    @property
+    def state(self):
+        """'connected', 'disconnected', or 'backoff' while waiting to retry a
+        failed connection."""
+        if self._socket:
+            return 'connected'
+        if time.monotonic() < self._retry_at:
+            return 'backoff'
+        return 'disconnected'
+
+    def _ensure_connected(self, force=False):
         """Set up a connection if one doesn't already exist.
 
+        Unless force is True, no attempt is made while backing off after a
+        failed attempt.
+
         Return True on success or False on failure.
 
         """
@@ -85,15 +224,29 @@ class Client(object):
             self._debug('_ensure_connected: already connected, doing nothing')
             return True
 
+        if not force and time.monotonic() < self._retry_at:
+            self._debug('_ensure_connected: backing off, doing nothing')
+            return False
+
         try:
             self._debug('_ensure_connected: trying to connect...')
             self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self._socket.settimeout(self._connect_timeout)
             self._socket.connect((self._ip, self._port))
+            self._socket.settimeout(None)
             self._debug('_ensure_connected:    ...success')
+            self._backoff = 0
+            self._retry_at = 0
             return True
         except socket.error:
             self._debug('_ensure_connected:    ...failure')
+            self._socket.close()
             self._socket = None
+            self._last_sent.clear()
+            self.reconnect_attempts += 1
+            self._backoff = min(self._max_backoff,
+                                max(self._min_backoff, self._backoff * 2))
+            self._retry_at = time.monotonic() + self._backoff
             return False
 
     def disconnect(self):
@@ -112,7 +265,7 @@ class Client(object):
         subsequent put_pixels calls.
 
         """
-        success = self._ensure_connected()
+        success = self._ensure_connected(force=True)
         if not self._long_connection:
             self.disconnect()
         return success
@@ -129,6 +282,9 @@ class Client(object):
             For example: [(255, 255, 255), (0, 0, 0), (127, 0, 0)]
             Floats will be rounded down to integers.
             Values outside the legal range will be clamped.
+            A PixelBuffer may be passed instead of a list, in which case its
+            storage is sent as-is without any conversion or copying.  A
+            PaletteFrame is expanded with a single lookup into its palette.
 
         Will establish a connection to the server as needed.
 
@@ -140,41 +296,132 @@ class Client(object):
         LED at a time (unless it's the first one).
 
         """
+        # encoding is only needed up front to compare against what was sent;
+        # otherwise a disconnected client drops the frame without encoding it
+        message = None
+        if self._suppress_duplicates:
+            message = pixel_message(pixels, channel, self._lut)
+            now = time.monotonic()
+            data = memoryview(message)[HEADER_SIZE:]
+            if self._is_duplicate(channel, data, now):
+                self._debug('put_pixels: unchanged.  not sending these pixels.')
+                self.suppressed_frames += 1
+                self.suppressed_bytes += len(message)
+                return True
+
         self._debug('put_pixels: connecting')
         is_connected = self._ensure_connected()
         if not is_connected:
             self._debug('put_pixels: not connected.  ignoring these pixels.')
+            self.dropped_frames += 1
+            return False
+
+        if message is None:
+            message = pixel_message(pixels, channel, self._lut)
+        self._debug('put_pixels: sending pixels to server')
+        try:
+            self._socket.send(message)
+        except socket.error:
+            self._debug('put_pixels: connection lost.  could not send pixels.')
+            self._socket = None
+            self._last_sent.clear()
+            self.dropped_frames += 1
             return False
 
-        # build OPC message
-        len_hi_byte = int(len(pixels)*3 / 256)
-        len_lo_byte = (len(pixels)*3) % 256
-        command = 0  # set pixel colors from openpixelcontrol.org
+        if self._suppress_duplicates:
+            self._record_sent(channel, data, now)
+
+        if not self._long_connection:
+            self._debug('put_pixels: disconnecting')
+            self.disconnect()
 
-        header = struct.pack("BBBB", channel, command, len_hi_byte, len_lo_byte)
+        return True
 
-        pieces = [ struct.pack( "BBB",
-                     min(255, max(0, int(r))),
-                     min(255, max(0, int(g))),
-                     min(255, max(0, int(b)))) for r, g, b in pixels ]
+    def _is_duplicate(self, channel, data, now):
+        """Return True if data is already showing on the channel and the
+        keepalive interval has not passed."""
+        last = self._last_sent.get(channel)
+        return (last is not None and now - last[1] < self._keepalive
+                and last[0] == data)
 
-        if sys.version_info[0] == 3:
-            # bytes!
-            message = header + b''.join(pieces)
+    def _record_sent(self, channel, data, now):
+        if channel == 0:
+            self._last_sent.clear()  # channel 0 overwrote every channel
+        else:
+            self._last_sent.pop(0, None)
+        self._last_sent[channel] = (bytes(data), now)
+
+    def _send_parts(self, parts):
+        if len(parts) <= _MAX_SEND_PARTS and hasattr(self._socket, 'sendmsg'):
+            sent = self._socket.sendmsg(parts)
+            if sent == sum(len(part) for part in parts):
+                return
+            message = b''.join(parts)[sent:]
         else:
-            # strings!
-            message = header + ''.join(pieces)
+            message = b''.join(parts)
+        self._socket.sendall(message)
 
-        self._debug('put_pixels: sending pixels to server')
+    def put_frames(self, frames):
+        """Send pixel colors to several channels of the OPC server at once.
+
+        frames: A dict mapping channel numbers to pixels, where the pixels
+            are anything accepted by put_pixels.  To mirror one frame onto
+            several channels, map each of them to the same object; it will
+            only be encoded once.
+
+        All of the messages are flushed to the server with a single system
+        call, rather than one send per channel.  When duplicate suppression is
+        on, only the channels whose pixels changed are sent.
+
+        Will establish a connection to the server as needed.
+
+        On successful transmission of pixels, return True.
+        On failure (bad connection), return False.
+
+        """
+        parts = None
+        if self._suppress_duplicates:
+            parts = frame_messages(frames, self._lut)
+            now = time.monotonic()
+            changed = []
+            for channel, header, data in zip(frames, parts[::2], parts[1::2]):
+                if self._is_duplicate(channel, data, now):
+                    self.suppressed_bytes += len(header) + len(data)
+                else:
+                    changed.append((channel, header, data))
+
+            if not changed:
+                self._debug('put_frames: unchanged.  not sending these pixels.')
+                self.suppressed_frames += 1
+                return True
+            parts = [part for _, header, data in changed
+                     for part in (header, data)]
+
+        self._debug('put_frames: connecting')
+        is_connected = self._ensure_connected()
+        if not is_connected:
+            self._debug('put_frames: not connected.  ignoring these pixels.')
+            self.dropped_frames += 1
+            return False
+
+        if parts is None:
+            parts = frame_messages(frames, self._lut)
+        self._debug('put_frames: sending pixels to server')
         try:
-            self._socket.send(message)
+            self._send_parts(parts)
         except socket.error:
-            self._debug('put_pixels: connection lost.  could not send pixels.')
+            self._debug('put_frames: connection lost.  could not send pixels.')
             self._socket = None
+            self._last_sent.clear()
+            self.dropped_frames += 1
             return False
 
+        if self._suppress_duplicates:
+            for channel, _, data in changed:
+                self._record_sent(channel, data, now)
+
         if not self._long_connection:
-            self._debug('put_pixels: disconnecting')
+            self._debug('put_frames: disconnecting')
             self.disconnect()
 
         return True
@@ -190,14 +437,8 @@ class Client(object):
         if not is_connected:
             self._debug('set_interpolation: not connected.  ignoring reconfiguration.')
             return False
-    
-        #build firmaware configuration message as documented on
-        #https://github.com/scanlime/fadecandy/blob/master/doc/fc_protocol_opc.md#set-firmware-configuration
-        if enabled:
-            config_bit = 0
-        else:
-            config_bit = 2
-        message = struct.pack('BBBBBBBBB', 0, 255, 0, 5, 0, 1, 0, 2, config_bit)
+
+        message = interpolation_message(enabled)
     
         self._debug('set_interpolation: sending firmware configuration')
         try:
@@ -212,3 +453,168 @@ class Client(object):
         return True
 
 
+class AsyncClient(object):
+
+    def __init__(self, server_ip_port, long_connection=True, verbose=False,
+                 connect_timeout=1.0, write_buffer_limit=65536):
+        """Create an OPC client object which sends pixels to an OPC server
+        from an asyncio event loop.
+
+        The arguments and connection modes are the same as for Client, and
+        put_pixels and set_interpolation behave the same way, except that they
+        are coroutines: connecting and sending never block the event loop, so
+        a single loop can drive many clients at once.
+
+        write_buffer_limit is the number of unsent bytes which may be queued
+        on the connection before put_pixels waits for the server to catch up.
+        Below the limit a frame is queued and put_pixels returns immediately.
+
+        Concurrent calls share a single connection attempt rather than each
+        opening a connection of their own, which gives up after
+        connect_timeout seconds.
+
+        """
+        self.verbose = verbose
+
+        self._long_connection = long_connection
+        self._connect_timeout = connect_timeout
+        self._write_buffer_limit = write_buffer_limit
+
+        self._ip, self._port = server_ip_port.split(':')
+        self._port = int(self._port)
+
+        self._writer = None  # will be None when we're not connected
+        self._connecting = None  # pending connection attempt, if any
+
+    def _debug(self, m):
+        if self.verbose:
+            print('    %s' % str(m))
+
+    async def _connect(self):
+        try:
+            self._debug('_ensure_connected: trying to connect...')
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(self._ip, self._port),
+                self._connect_timeout)
+            writer.transport.set_write_buffer_limits(
+                high=self._write_buffer_limit)
+            self._writer = writer
+            self._debug('_ensure_connected:    ...success')
+            return True
+        except (OSError, asyncio.TimeoutError):
+            self._debug('_ensure_connected:    ...failure')
+            self._writer = None
+            return False
+        finally:
+            self._connecting = None
+
+    async def _ensure_connected(self):
+        """Set up a connection if one doesn't already exist.
+
+        Return True on success or False on failure.
+
+        """
+        if self._writer and not self._writer.is_closing():
+            self._debug('_ensure_connected: already connected, doing nothing')
+            return True
+
+        if self._connecting is None:
+            self._connecting = asyncio.ensure_future(self._connect())
+        return await asyncio.shield(self._connecting)
+
+    def disconnect(self):
+        """Drop the connection to the server, if there is one."""
+        self._debug('disconnecting')
+        if self._writer:
+            self._writer.close()
+        self._writer = None
+
+    async def can_connect(self):
+        """Try to connect to the server.
+
+        Return True on success or False on failure.
+
+        If in long connection mode, this connection will be kept and re-used for
+        subsequent put_pixels calls.
+
+        """
+        success = await self._ensure_connected()
+        if not self._long_connection:
+            self.disconnect()
+        return success
+
+    async def _send(self, parts, name):
+        # hold on to the writer: disconnect() may clear it while draining
+        writer = self._writer
+        if writer is None:
+            self._debug('%s: disconnected.  could not send.' % name)
+            return False
+        try:
+            # join into immutable bytes: frames may be reused by the caller
+            # before the transport has finished sending them
+            writer.write(b''.join(parts))
+            # only waits if more than write_buffer_limit bytes are queued
+            await writer.drain()
+        except OSError:
+            self._debug('%s: connection lost.  could not send.' % name)
+            if self._writer is writer:
+                self._writer = None
+            return False
+
+        if not self._long_connection:
+            self._debug('%s: disconnecting' % name)
+            self.disconnect()
+        return True
+
+    async def put_pixels(self, pixels, channel=0):
+        """Send the list of pixel colors to the OPC server on the given channel.
+
+        See Client.put_pixels.
+
+        On successful transmission of pixels, return True.
+        On failure (bad connection), return False.
+
+        """
+        self._debug('put_pixels: connecting')
+        is_connected = await self._ensure_connected()
+        if not is_connected:
+            self._debug('put_pixels: not connected.  ignoring these pixels.')
+            return False
+
+        self._debug('put_pixels: sending pixels to server')
+        return await self._send([pixel_message(pixels, channel)],
+                                'put_pixels')
+
+    async def put_frames(self, frames):
+        """Send pixel colors to several channels of the OPC server at once.
+
+        See Client.put_frames.
+
+        On successful transmission of pixels, return True.
+        On failure (bad connection), return False.
+
+        """
+        self._debug('put_frames: connecting')
+        is_connected = await self._ensure_connected()
+        if not is_connected:
+            self._debug('put_frames: not connected.  ignoring these pixels.')
+            return False
+
+        self._debug('put_frames: sending pixels to server')
+        return await self._send(frame_messages(frames), 'put_frames')
+
+    async def set_interpolation(self, enabled=True):
+        """
+        Enables or disables frame interpolation on runtime.
+
+        Return True on success.
+        """
+        self._debug('set_interpolation: connecting')
+        is_connected = await self._ensure_connected()
+        if not is_connected:
+            self._debug('set_interpolation: not connected.  ignoring reconfiguration.')
+            return False
+
+        self._debug('set_interpolation: sending firmware configuration')
+        return await self._send([interpolation_message(enabled)],
+                                'set_interpolation')
@@ -0,0 +1,87 @@
+"""
+Module for rendering long shows on every core. :func:`~render_parallel` splits
+a range of frames of a seekable lighting configuration into chunks, renders
+the chunks in worker processes and hands them back in order.
+
+Each worker is sent a pickled copy of the configuration and seeks it to the
+start of its chunk, so the configuration itself is left untouched.
+"""
+
+import collections
+import os
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator
+
+from .buffer import encode_pixels
+from .interface import DynamicLightConfig, LightConfig
+
+__all__ = ['render_chunk', 'render_parallel']
+
+
+def render_chunk(config: LightConfig, start: int, stop: int) -> bytes:
+    """
+    Render a range of frames of a seekable lighting configuration. The
+    configuration is left at the end of the range.
+
+    :param config: the lighting configuration to render
+    :param start: the number of the first frame to render
+    :param stop: the number of the frame after the last one to render
+    :return: the encoded pixel data of the frames, one after another; shorter
+        than the range if the configuration runs out of frames
+    :raises NotImplementedError: if frames can only be rendered in order
+    """
+    if isinstance(config, DynamicLightConfig):
+        config.seek(start)
+    n = max(0, stop - start)
+    if numpy is not None:
+        return config.render_batch(n).tobytes()
+
+    frames = []
+    for _ in range(n):
+        try:
+            frames.append(encode_pixels(next(config)))
+        except StopIteration:
+            break
+    return b''.join(frames)
+
+
+def render_parallel(config: LightConfig, start: int, stop: int,
+                    workers: int = None,
+                    chunk_frames: int = 1024) -> Iterator[bytes]:
+    """
+    Render a range of frames of a seekable lighting configuration in worker
+    processes.
+
+    Only a few chunks per worker are rendered ahead of the one being
+    consumed, so a long range does not have to fit in memory.
+
+    :param config: the lighting configuration to render; it must be picklable
+    :param start: the number of the first frame to render
+    :param stop: the number of the frame after the last one to render
+    :param workers: (optional) the number of processes to render with, if not
+        the number of CPUs
+    :param chunk_frames: the number of frames each process renders at once
+    :return: an iterator of the encoded pixel data of each chunk, as returned
+        by :func:`render_chunk`, in order
+    :raises NotImplementedError: if frames can only be rendered in order
+    """
+    if not config.seekable:
+        raise NotImplementedError(f'{type(config).__name__} can only render '
+                                  f'frames in order')
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(workers) as pool:
+        pending = collections.deque()
+        for first in range(start, stop, chunk_frames):
+            pending.append(pool.submit(render_chunk, config, first,
+                                       min(first + chunk_frames, stop)))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
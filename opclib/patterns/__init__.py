@@ -1,9 +1,12 @@
 from . import modifiers
 
 from .fade import Fade
+from .field import Field
 from .scroll import Scroll
 from .solid_color import SolidColor
 from .stripes import Stripes
 from .off import Off
+from .playback import Playback
 
-__all__ = ['Fade', 'Scroll', 'SolidColor', 'Stripes', 'Off']
+__all__ = ['Fade', 'Field', 'Scroll', 'SolidColor', 'Stripes', 'Off',
+           'Playback']
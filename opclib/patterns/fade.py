@@ -1,4 +1,11 @@
 from typing import List
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from ..buffer import PixelBuffer, uniform_frame
 from ..interface import DynamicLightConfig
 from ..opcutil import ColorHex, ColorData, get_color, shift
 
@@ -8,12 +15,11 @@ class Fade(DynamicLightConfig):
     Fade between specified colors.
     """
     speed: float = 4.0
+    seekable = True
     color_list: List[ColorData]  # colors to fade between
-    pixels: List[ColorData]  # current list of pixels
 
-    _current_color: ColorData
-    _color_index = 0  # index of color being faded towards in self.colors
-    _fade_index = 0  # how far we are between two colors [0-9]
+    steps = 10  # number of frames spent fading towards each color
+    rate = 0.1  # how far each frame shifts towards the current color
 
     def __init__(self, color_list: List[ColorHex], **kwargs):
         """
@@ -24,20 +30,64 @@ class Fade(DynamicLightConfig):
         self.validate_color_list(color_list)
 
         self.color_list = [get_color(c) for c in color_list]
-        self._current_color = self.color_list[0]
-        self.pixels = [self._current_color] * self.num_leds
+        self._cycle = self._limit_cycle()
+
+    @property
+    def period(self) -> int:
+        """
+        The number of frames it takes to fade through every color once.
+        """
+        return self.steps * len(self.color_list)
+
+    @property
+    def pixels(self) -> List[ColorData]:
+        """
+        The current list of pixels.
+        """
+        return self.render_frame(self.frame_index).tolist()
+
+    def target(self, index: int) -> ColorData:
+        """
+        Get the color which frame ``index`` shifts towards.
+        """
+        return self.color_list[(index // self.steps) % len(self.color_list)]
 
-    def __next__(self) -> List[ColorData]:
-        if self._fade_index == 9:
-            # go to next color
-            self._color_index = (self._color_index + 1) % len(self.color_list)
+    def _limit_cycle(self) -> List[ColorData]:
+        # Each frame shifts 10% of the way towards the current target, so
+        # every frame is c[k] = c[k-1] + (target(k) - c[k-1]) * rate. The
+        # targets repeat every period, so the colors settle into a repeating
+        # cycle; find the start of that cycle by summing the geometric series,
+        # then step through one period of it.
+        keep = 1 - self.rate
+        start = (0.0, 0.0, 0.0)
+        for k in range(1, self.period + 1):
+            start = shift(start, self.target(k), self.rate)
+        scale = 1 / (1 - keep ** self.period)
+        cycle = [(start[0] * scale, start[1] * scale, start[2] * scale)]
 
-        # increment _fade_index, or wrap back to 0
-        self._fade_index = (self._fade_index + 1) % 10
+        for k in range(1, self.period):
+            cycle.append(shift(cycle[-1], self.target(k), self.rate))
+        return cycle
 
-        # shift pixels 10% towards the next color
-        self._current_color = shift(self._current_color,
-                                    self.color_list[self._color_index], 0.1)
-        self.pixels = [self._current_color] * self.num_leds
+    def render_frame(self, index: int) -> PixelBuffer:
+        # The difference between the fade (which starts at the first color)
+        # and the repeating cycle shrinks by a factor of (1 - rate) per frame.
+        index = max(0, index)
+        base = self._cycle[index % self.period]
+        start = self._cycle[0]
+        decay = (1 - self.rate) ** index
+        # round off floating point error so that exact colors truncate to
+        # themselves, rather than to one less
+        color = tuple(round(b + (c - s) * decay, 6)
+                      for b, c, s in zip(base, self.color_list[0], start))
+        return uniform_frame(color, self.num_leds)
 
-        return self.pixels
+    def render_batch(self, n: int) -> 'numpy.ndarray':
+        # the closed form of render_frame, for every frame at once
+        index = numpy.maximum(0, self.batch_indices(n))
+        cycle = numpy.array(self._cycle)
+        decay = (1 - self.rate) ** index.astype(numpy.float64)
+        colors = cycle[index % self.period] + numpy.outer(
+            decay, numpy.subtract(self.color_list[0], cycle[0]))
+        colors = numpy.clip(numpy.round(colors, 6), 0, 255).astype(numpy.uint8)
+        return numpy.repeat(colors[:, None], self.num_leds, axis=1)
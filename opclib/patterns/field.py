@@ -0,0 +1,63 @@
+from typing import Any, Callable
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from ..buffer import PixelBuffer
+from ..interface import DynamicLightConfig, require_numpy
+
+
+class Field(DynamicLightConfig):
+    """
+    Color LEDs by their position in space.
+
+    The pattern is a function of ``(x, y, t)`` which is called once per frame
+    with the coordinate arrays of a :class:`~opclib.layout.Layout` and the
+    time in seconds, and returns the colors of every LED at once: an array of
+    shape ``(num_leds, 3)``, or anything which broadcasts to it. For example,
+    a red wave moving across a matrix::
+
+        def wave(x, y, t):
+            red = 127.5 + 127.5 * numpy.sin(x - 4 * t)
+            return numpy.stack([red, 0 * red, 0 * red], axis=-1)
+
+        Field(wave, Layout.grid(16, 16, serpentine=True))
+
+    NumPy is required to use this pattern (``pip install opclib[numpy]``).
+    """
+    speed: float = 30.0
+    seekable = True
+    func: Callable[[Any, Any, float], Any]  # colors of the LEDs at a time
+    layout: Any  # positions of the LEDs
+
+    def __init__(self, func: Callable[[Any, Any, float], Any], layout: Any,
+                 **kwargs):
+        """
+        Initialize a new Field configuration.
+
+        :param func: a function of the x and y coordinate arrays and the time
+            returning the color of each LED
+        :param layout: the :class:`~opclib.layout.Layout` of the LEDs
+        :raises ImportError: if NumPy is not installed
+        :raises ValueError: if ``num_leds`` is not the size of the layout
+        """
+        require_numpy('Field')
+        kwargs.setdefault('num_leds', len(layout))
+        super().__init__(**kwargs)
+        if self.num_leds != len(layout):
+            raise ValueError(f'layout has {len(layout)} LEDs, but num_leds '
+                             f'is {self.num_leds}')
+
+        self.func = func
+        self.layout = layout
+
+    def render_frame(self, index: int) -> PixelBuffer:
+        colors = self.func(self.layout.x, self.layout.y, index / self.speed)
+        colors = numpy.broadcast_to(colors, (self.num_leds, 3))
+
+        frame = PixelBuffer(self.num_leds)
+        frame.data[:] = numpy.clip(colors, 0, 255).astype(
+            numpy.uint8).tobytes()
+        return frame
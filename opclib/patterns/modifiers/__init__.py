@@ -3,6 +3,10 @@ This package contains patterns which are modifiers for existing patterns. If
 a pattern takes another pattern in its constructor, it belongs in this package.
 """
 
+from .cache import Cache
+from .composite import Composite
+from .interpolate import Interpolate
+from .segments import Segments
 from .strobe import Strobe
 
-__all__ = ['Strobe']
+__all__ = ['Cache', 'Composite', 'Interpolate', 'Segments', 'Strobe']
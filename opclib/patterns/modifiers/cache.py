@@ -0,0 +1,105 @@
+from typing import List, Optional
+
+from ...buffer import HEADER_SIZE, PixelBuffer, encode_pixels
+from ...interface import DynamicLightConfig
+
+
+class Cache(DynamicLightConfig):
+    """
+    Replay a repeating ``DynamicLightConfig`` from memory.
+
+    The wrapped config must declare a :attr:`~LightConfig.period`. Frames are
+    rendered and encoded as usual while being stored in one contiguous buffer,
+    one slot per frame of the period. Once a whole period has been rendered
+    which is identical to the one before it, the animation is known to repeat
+    and every later frame is served straight from the buffer, without
+    rendering or encoding anything. This also covers patterns like ``Fade``,
+    which only settle into their cycle after a while. Each frame returned is a
+    copy of its slot, so it may be modified without affecting later cycles.
+
+    A period passed to the constructor is trusted instead: frames are served
+    from the buffer as soon as one whole period has been stored.
+    """
+    cycle_start: Optional[int] = None  # first frame served from the cache
+
+    def __init__(self, config: DynamicLightConfig, period: int = None,
+                 max_bytes: int = 8 * 2 ** 20, **kwargs):
+        """
+        Initialize a new Cache configuration.
+
+        If the period is unknown, or one period of frames would take more than
+        ``max_bytes`` to store, nothing is cached and the frames of ``config``
+        are passed through unchanged.
+
+        :param config: the light config to cache
+        :param period: (optional) the number of frames after which ``config``
+            repeats exactly, if it does not declare it itself; the frames are
+            then not checked for repetition
+        :param max_bytes: the most memory to use for cached frames
+        """
+        kwargs.setdefault('num_leds', config.num_leds)
+        super().__init__(config.speed, **kwargs)
+
+        self._config = config
+        self.period = period or config.period
+        self._trusted = period is not None  # whether to skip checking
+
+        self._slots: List[PixelBuffer] = []
+        size = HEADER_SIZE + 3 * max(0, self.num_leds)
+        if self.period and self.period * size <= max_bytes:
+            storage = bytearray(self.period * size)
+            self._slots = [PixelBuffer.over(storage, self.num_leds, i * size)
+                           for i in range(self.period)]
+
+        # consecutive frames stored, if the period is trusted, otherwise
+        # consecutive frames equal to the one a period before
+        self._matches = 0
+        self._last_index = None  # most recently stored frame
+
+    @property
+    def seekable(self) -> bool:
+        return self._config.seekable
+
+    @property
+    def cached(self) -> bool:
+        """
+        Whether frames are being served from the cache.
+        """
+        return self.cycle_start is not None
+
+    def _store(self, index: int, pixels) -> PixelBuffer:
+        slot = self._slots[index % self.period]
+        data = encode_pixels(pixels)
+        consecutive = self._last_index == index - 1
+        if self._trusted:
+            slot.data[:] = data
+            self._matches = self._matches + 1 if consecutive else 1
+        elif consecutive and slot.data == data:
+            self._matches += 1
+        else:
+            slot.data[:] = data
+            self._matches = 0
+        self._last_index = index
+
+        if self._matches >= self.period:
+            self.cycle_start = index + 1 - self.period
+        return slot.copy()
+
+    def __next__(self):
+        self.frame_index += 1
+        if self.cached:
+            return self._slots[self.frame_index % self.period].copy()
+
+        if self.seekable:
+            pixels = self._config.render_frame(self.frame_index)
+        else:
+            pixels = next(self._config)
+
+        if not self._slots:
+            return pixels
+        return self._store(self.frame_index, pixels)
+
+    def render_frame(self, index: int):
+        if self.cached and index >= self.cycle_start:
+            return self._slots[index % self.period].copy()
+        return self._config.render_frame(index)
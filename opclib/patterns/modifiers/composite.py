@@ -0,0 +1,103 @@
+from typing import List, Tuple, Union
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from ...buffer import PixelBuffer, encode_pixels
+from ...interface import LightConfig
+from .group import Group
+
+LayerSpec = Union[LightConfig, Tuple[LightConfig, float],
+                  Tuple[LightConfig, float, str]]
+
+# how each blend mode combines the layers below (a) with a layer (b), for
+# whole arrays and for single values
+_ARRAY_MODES = {
+    'normal': lambda a, b: b,
+    'add': lambda a, b: a + b,
+    'multiply': lambda a, b: a * b / 255,
+    'max': lambda a, b: numpy.maximum(a, b),
+}
+_VALUE_MODES = dict(_ARRAY_MODES, max=max)
+
+
+class Composite(Group):
+    """
+    Stack several ``LightConfig``\\ s as layers.
+
+    Each layer is blended onto the layers below it with a blend mode, then
+    mixed in according to its opacity:
+
+    * ``'normal'``: the layer replaces what is below it
+    * ``'add'``: the colors are added together
+    * ``'multiply'``: the colors are multiplied, as fractions of 255
+    * ``'max'``: the brighter of the two values is kept
+
+    With NumPy installed each layer is blended over the whole frame in one
+    vectorized operation.
+    """
+    layers: List[Tuple[LightConfig, float, str]]  # (config, opacity, mode)
+
+    def __init__(self, layers: List[LayerSpec], speed: float = None,
+                 **kwargs):
+        """
+        Initialize a new Composite configuration.
+
+        :param layers: the layers from bottom to top; each is a light config,
+            or a tuple of a light config, its opacity (0-1, default 1) and its
+            blend mode (default ``'normal'``)
+        :param speed: (optional) the speed to composite at, if not that of the
+            fastest layer
+        :raises ValueError: if there are no layers, a blend mode is unknown,
+            or the layers differ in ``num_leds``
+        """
+        if not layers:
+            raise ValueError('no layers provided')
+
+        self.layers = []
+        for layer in layers:
+            if isinstance(layer, LightConfig):
+                layer = (layer,)
+            # fill in the defaults for anything left out
+            config, opacity, mode = \
+                tuple(layer) + (1.0, 'normal')[len(layer) - 1:]
+            if mode not in _ARRAY_MODES:
+                raise ValueError(f'{mode!r} is not a blend mode; use one of '
+                                 f'{list(_ARRAY_MODES)}')
+            self.layers.append((config, opacity, mode))
+
+        configs = [config for config, _, _ in self.layers]
+        if len({config.num_leds for config in configs}) > 1:
+            raise ValueError('all layers must have the same num_leds')
+
+        kwargs.setdefault('num_leds', configs[0].num_leds)
+        super().__init__(configs, speed, **kwargs)
+
+    def render_frame(self, index: int) -> PixelBuffer:
+        frames = [encode_pixels(self.config_frame(i, index)[0])
+                  for i in range(len(self.layers))]
+        frame = PixelBuffer(self.num_leds)
+        if numpy is not None:
+            frame.data[:] = self._blend_arrays(frames)
+        else:
+            frame.data[:] = self._blend_values(frames)
+        return frame
+
+    def _blend_arrays(self, frames: List[bytes]) -> bytes:
+        result = numpy.zeros(3 * max(0, self.num_leds))
+        for data, (_, opacity, mode) in zip(frames, self.layers):
+            layer = numpy.frombuffer(data, numpy.uint8).astype(numpy.float64)
+            blended = _ARRAY_MODES[mode](result, layer)
+            result += (blended - result) * opacity
+            numpy.clip(result, 0, 255, out=result)
+        return result.astype(numpy.uint8).tobytes()
+
+    def _blend_values(self, frames: List[bytes]) -> bytes:
+        result = [0.0] * (3 * max(0, self.num_leds))
+        for data, (_, opacity, mode) in zip(frames, self.layers):
+            blend = _VALUE_MODES[mode]
+            result = [min(255, max(0, a + (blend(a, b) - a) * opacity))
+                      for a, b in zip(result, data)]
+        return bytes(map(int, result))
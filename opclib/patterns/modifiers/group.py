@@ -0,0 +1,84 @@
+import math
+
+from typing import List, Tuple
+
+from ...interface import DynamicLightConfig, LightConfig
+
+
+class Group(DynamicLightConfig):
+    """
+    Base class for modifiers which combine several ``LightConfig``\\ s, each
+    shown at its own speed.
+
+    The group runs at the speed of its fastest config. On every frame of the
+    group, each config is asked for the frame it would be showing at that
+    moment, and is only rendered again if that frame has changed since the
+    group's last frame.
+    """
+
+    def __init__(self, configs: List[LightConfig], speed: float = None,
+                 **kwargs):
+        """
+        Initialize a new Group configuration.
+
+        :param configs: the light configs to combine
+        :param speed: (optional) the speed of the group, if not that of its
+            fastest config
+        """
+        speeds = [c.speed for c in configs
+                  if isinstance(c, DynamicLightConfig)]
+        # if there is no speed to reference, use default value
+        super().__init__(speed or max(speeds, default=10), **kwargs)
+
+        self._configs = configs
+        self._rendered = [0] * len(configs)  # frames stepped with next()
+        self._frames = [(None, None)] * len(configs)  # (index, frame)
+
+    @property
+    def seekable(self) -> bool:
+        return all(c.seekable for c in self._configs)
+
+    @property
+    def period(self):
+        period = 1
+        for config in self._configs:
+            if config.period is None:
+                return None
+            if isinstance(config, DynamicLightConfig):
+                frames = config.period * self.speed / config.speed
+                if not float(frames).is_integer():
+                    return None
+                period = period * int(frames) // math.gcd(period, int(frames))
+        return period
+
+    def _frame_index(self, config: LightConfig, index: int) -> int:
+        if isinstance(config, DynamicLightConfig):
+            # frames are numbered from 1 by next(), so frame 1 of the group
+            # shows frame 1 of every config
+            return math.floor((index - 1) * config.speed / self.speed) + 1
+        return 0
+
+    def config_frame(self, i: int, index: int) -> Tuple[object, bool]:
+        """
+        Get the frame one of the configs shows during a frame of the group.
+
+        :param i: the position of the config in the group
+        :param index: the number of the group's frame
+        :return: the config's frame, and whether it differs from the frame
+            returned last time
+        """
+        config = self._configs[i]
+        config_index = self._frame_index(config, index)
+        last_index, frame = self._frames[i]
+        if config_index == last_index:
+            return frame, False
+
+        if config.seekable:
+            frame = config.render_frame(config_index)
+        else:
+            # step through every frame, but never backwards
+            while self._rendered[i] < max(1, config_index):
+                frame = next(config)
+                self._rendered[i] += 1
+        self._frames[i] = (config_index, frame)
+        return frame, True
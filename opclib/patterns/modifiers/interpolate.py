@@ -0,0 +1,96 @@
+import math
+
+from typing import Dict
+
+from ...buffer import PixelBuffer, lerp_frames
+from ...interface import DynamicLightConfig
+
+
+class Interpolate(DynamicLightConfig):
+    """
+    Smooth a ``DynamicLightConfig`` by blending between its frames.
+
+    The wrapped config is rendered at its own ``speed`` as usual, but frames
+    are output at a higher fixed ``rate``, each one a linear interpolation
+    between the two rendered frames (keyframes) on either side of it. This
+    gives smooth output from OPC servers which do not interpolate themselves,
+    without rendering the pattern any more often.
+    """
+
+    def __init__(self, config: DynamicLightConfig, rate: float = 60.0,
+                 **kwargs):
+        """
+        Initialize a new Interpolate configuration.
+
+        If ``config`` can only render its frames in order, the output lags
+        one keyframe behind, since the next keyframe has to be rendered before
+        the frames leading up to it can be.
+
+        :param config: the light config to interpolate
+        :param rate: the number of frames to output per second
+        """
+        kwargs.setdefault('num_leds', config.num_leds)
+        super().__init__(rate, **kwargs)
+
+        self._config = config
+        self._keyframes: Dict[int, PixelBuffer] = {}
+        self._rendered = 0  # keyframes rendered with next(), if not seekable
+
+    @property
+    def seekable(self) -> bool:
+        return self._config.seekable
+
+    @property
+    def period(self):
+        if self._config.period is None:
+            return None
+        period = self._config.period * self.speed / self._config.speed
+        return int(period) if float(period).is_integer() else None
+
+    def _keyframe(self, index: int) -> PixelBuffer:
+        frame = self._keyframes.get(index)
+        if frame is not None:
+            return frame
+
+        if self.seekable:
+            pixels = self._config.render_frame(index)
+        elif index <= self._rendered:
+            raise NotImplementedError(f'{type(self._config).__name__} can '
+                                      f'only render frames in order')
+        else:
+            while self._rendered < index:
+                pixels = next(self._config)
+                self._rendered += 1
+            if isinstance(pixels, PixelBuffer):
+                pixels = pixels.copy()  # may be reused by the config
+        if not isinstance(pixels, PixelBuffer):
+            pixels = PixelBuffer(self.num_leds, pixels)
+        self._keyframes[index] = pixels
+        return pixels
+
+    def __next__(self):
+        if self.seekable:
+            return super().__next__()
+        self.frame_index += 1
+        # keyframes come from next(), which starts at frame 1
+        return self._render(self.frame_index, 1)
+
+    def render_frame(self, index: int):
+        if not self.seekable:
+            return super().render_frame(index)  # raises NotImplementedError
+        return self._render(index, 0)
+
+    def _render(self, index: int, offset: int):
+        position = index * self._config.speed / self.speed
+        key = math.floor(position)
+        progress = position - key
+        key += offset
+
+        # only the keyframes around the current frame are needed again
+        for old in [k for k in self._keyframes if k < key or k > key + 1]:
+            del self._keyframes[old]
+
+        start = self._keyframe(key)
+        if not progress:
+            return start
+        return lerp_frames(start, self._keyframe(key + 1), progress)
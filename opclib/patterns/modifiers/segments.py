@@ -0,0 +1,68 @@
+from typing import List, Tuple
+
+from ...buffer import PixelBuffer
+from ...interface import LightConfig
+from .group import Group
+
+
+class Segments(Group):
+    """
+    Show several ``LightConfig``\\ s side by side on one strip.
+
+    Each config is drawn on its own range of LEDs, starting at a given LED and
+    covering ``num_leds`` of the config. Every config keeps its own speed.
+
+    When stepped with ``next``, all segments are drawn into one frame which is
+    allocated once. On each frame, only the segments whose config moved on to
+    a new frame are copied in again; the rest of the frame is left as it was.
+    The same frame is returned by every call to ``next``, so it must not be
+    modified, and should be copied if it needs to be kept past the next
+    frame. :meth:`render_frame` returns a frame of its own.
+    """
+    segments: List[Tuple[int, LightConfig]]  # (start, config)
+
+    def __init__(self, segments: List[Tuple[int, LightConfig]],
+                 speed: float = None, **kwargs):
+        """
+        Initialize a new Segments configuration.
+
+        :param segments: ``(start, config)`` pairs giving the first LED of
+            each config's range
+        :param speed: (optional) the speed to render at, if not that of the
+            fastest config
+        :raises ValueError: if there are no segments, or segments overlap or
+            start before the first LED
+        """
+        if not segments:
+            raise ValueError('no segments provided')
+
+        self.segments = sorted(segments, key=lambda segment: segment[0])
+        end = 0
+        for start, config in self.segments:
+            if start < end:
+                raise ValueError(f'segment starting at LED {start} overlaps '
+                                 'another segment or starts before LED 0')
+            end = start + config.num_leds
+
+        kwargs.setdefault('num_leds', end)
+        super().__init__([config for _, config in self.segments], speed,
+                         **kwargs)
+        if self.num_leds < end:
+            raise ValueError(f'segments need {end} LEDs, but num_leds is '
+                             f'{self.num_leds}')
+
+        self._frame = PixelBuffer(self.num_leds)
+
+    def __next__(self) -> PixelBuffer:
+        self.frame_index += 1
+        return self._draw(self.frame_index)
+
+    def render_frame(self, index: int) -> PixelBuffer:
+        return self._draw(index).copy()
+
+    def _draw(self, index: int) -> PixelBuffer:
+        for i, (start, config) in enumerate(self.segments):
+            frame, changed = self.config_frame(i, index)
+            if changed:
+                self._frame[start:start + config.num_leds] = frame
+        return self._frame
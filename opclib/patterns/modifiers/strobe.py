@@ -1,3 +1,11 @@
+import math
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from ...buffer import uniform_frame
 from ...interface import LightConfig, DynamicLightConfig
 from ..solid_color import SolidColor
 
@@ -6,7 +14,6 @@ class Strobe(DynamicLightConfig):
     """
     Add a strobe effect to a given ``LightConfig``.
     """
-    _strobe_count = 0
 
     def __init__(self, config: LightConfig = SolidColor('#FFFFFF'),
                  strobe_speed: int = 2, **kwargs):
@@ -35,6 +42,7 @@ class Strobe(DynamicLightConfig):
         :param config: the light config to add a strobe effect to
         :param strobe_speed: the speed to strobe at (1 is fastest)
         """
+        kwargs.setdefault('num_leds', config.num_leds)
         if isinstance(config, DynamicLightConfig):
             super().__init__(config.speed, **kwargs)
         else:
@@ -44,11 +52,54 @@ class Strobe(DynamicLightConfig):
         self._config = config
         self.strobe_speed = strobe_speed
 
+    @property
+    def seekable(self) -> bool:
+        return self._config.seekable
+
+    @property
+    def period(self):
+        if self._config.period is None:
+            return None
+        # least common multiple of the two periods
+        return (self._config.period * self.strobe_speed
+                // math.gcd(self._config.period, self.strobe_speed))
+
+    def is_off(self, index: int) -> bool:
+        """
+        Determine whether frame ``index`` is one of the "off" frames.
+        """
+        return index % self.strobe_speed == 0
+
     def __next__(self):
-        self._strobe_count = (self._strobe_count + 1) % self.strobe_speed
+        if self.seekable:
+            return super().__next__()
+
+        # the wrapped config has to be stepped through every frame
+        self.frame_index += 1
         pixels = next(self._config)
+        if self.is_off(self.frame_index):
+            return uniform_frame((0, 0, 0), self.num_leds)
+        return pixels
+
+    def render_frame(self, index: int):
+        if self.is_off(index):
+            return uniform_frame((0, 0, 0), self.num_leds)
+        return self._config.render_frame(index)
 
-        if self._strobe_count == 0:
-            return [(0, 0, 0)] * self.num_leds
+    def render_batch(self, n: int) -> 'numpy.ndarray':
+        if not self.seekable:
+            return super().render_batch(n)  # step through every frame
+
+        index = self.batch_indices(n)
+        config = self._config
+        if isinstance(config, DynamicLightConfig):
+            # render the wrapped config's frames with the same numbers, then
+            # put it back where it was
+            frame_index = config.frame_index
+            config.seek(index[0] if n else 0)
+            batch = config.render_batch(n)
+            config.frame_index = frame_index
         else:
-            return pixels
+            batch = config.render_batch(n)
+        batch[self.is_off(index)] = 0
+        return batch
@@ -0,0 +1,92 @@
+import mmap
+
+from typing import Optional
+
+from ..buffer import HEADER_SIZE, PixelBuffer
+from ..interface import DynamicLightConfig
+from ..recording import RECORDING_HEADER_SIZE, unpack_recording_header
+
+
+class Playback(DynamicLightConfig):
+    """
+    Play back a show recorded with :func:`opclib.recording.record`.
+
+    The recording is memory-mapped read-only rather than read, and each frame
+    is a view of the mapping, so playing a frame involves no decoding or
+    copying. Every frame is stored as a complete message for channel 0, which
+    is sent straight from the mapping; frames cannot be modified.
+
+    Unless ``loop`` is set, playback stops after the last frame.
+    """
+    seekable = True
+    path: str  # the recording being played
+    frames: int  # number of frames in the recording
+    loop: bool  # whether to start again after the last frame
+
+    def __init__(self, path: str, loop: bool = False, **kwargs):
+        """
+        Initialize a new Playback configuration. ``num_leds`` and ``speed``
+        default to those the show was recorded with.
+
+        :param path: the recording to play
+        :param loop: whether to start again after the last frame
+        :raises ValueError: if the file is not a complete recording, or
+            ``num_leds`` does not match it
+        """
+        with open(path, 'rb') as f:
+            num_leds, frames, speed = unpack_recording_header(
+                f.read(RECORDING_HEADER_SIZE))
+            self._frame_size = HEADER_SIZE + 3 * num_leds
+            size = RECORDING_HEADER_SIZE + frames * self._frame_size
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < size:
+            self._map.close()
+            raise ValueError(f'recording is missing frames; expected {size} '
+                             f'bytes, found {len(self._map)}')
+
+        kwargs.setdefault('num_leds', num_leds)
+        kwargs.setdefault('speed', speed)
+        super().__init__(**kwargs)
+        if self.num_leds != num_leds:
+            self._map.close()
+            raise ValueError(f'recording has {num_leds} LEDs, but num_leds is '
+                             f'{self.num_leds}')
+
+        self.path = path
+        self.frames = frames
+        self.loop = loop
+
+    @property
+    def period(self) -> Optional[int]:
+        """
+        The number of frames in the recording, if it loops.
+        """
+        return self.frames if self.loop and self.frames else None
+
+    def render_frame(self, index: int) -> PixelBuffer:
+        # the recording starts with frame 1, the first frame from next()
+        slot = max(0, index - 1)
+        if self.loop and self.frames:
+            slot %= self.frames
+        elif slot >= self.frames:
+            raise StopIteration
+        return PixelBuffer.over(self._map, self.num_leds,
+                                RECORDING_HEADER_SIZE + slot * self._frame_size)
+
+    def __getstate__(self):
+        # the mapping cannot be pickled, so map the file again when unpickled
+        state = self.__dict__.copy()
+        del state['_map']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        with open(self.path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self) -> None:
+        """
+        Unmap the recording. No frames can be played afterwards, and frames
+        played earlier must no longer be in use.
+        """
+        self._map.close()
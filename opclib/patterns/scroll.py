@@ -1,6 +1,13 @@
 from typing import List
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from ..buffer import PaletteFrame, PixelBuffer
 from ..interface import DynamicLightConfig
-from ..opcutil import ColorData, get_color, spread, even_spread, rotate_right
+from ..opcutil import ColorData, get_color
 
 
 class Scroll(DynamicLightConfig):
@@ -8,9 +15,9 @@ class Scroll(DynamicLightConfig):
     Scroll through a multi-colored line.
     """
     speed: float = 1.8
+    seekable = True
     color_list: List[ColorData]  # colors to scroll
     width: int  # (optional) number of pixels per color
-    pixels: List[ColorData]  # current list of pixels
 
     def __init__(self, color_list: List[str], width: int = None, **kwargs):
         """
@@ -25,11 +32,61 @@ class Scroll(DynamicLightConfig):
         self.color_list = [get_color(c) for c in color_list]
         self.width = width
 
-        if width:
-            self.pixels = spread(self.color_list, width, self.num_leds)
-        else:
-            self.pixels = even_spread(self.color_list, self.num_leds)
+        self._base = PaletteFrame.spread(self.color_list, width,
+                                         self.num_leds)
+
+        # Every rotation of the base pattern is a contiguous run of the
+        # pattern repeated twice, so a frame is a single copy out of it.
+        self._length = len(self._base)
+        self._ring = self._base.encode() * 2
+
+    @property
+    def period(self) -> int:
+        """
+        The number of frames it takes to scroll all the way around.
+        """
+        return max(1, self._length)
+
+    @property
+    def pixels(self) -> List[ColorData]:
+        """
+        The current list of pixels.
+        """
+        return self.render_frame(self.frame_index).tolist()
+
+    def render_frame(self, index: int) -> PixelBuffer:
+        frame = PixelBuffer(self._length)
+        if self._length:
+            # rotating right by index starts the frame that far from the end
+            start = 3 * (-index % self._length)
+            ring = memoryview(self._ring)
+            frame.data[:] = ring[start:start + len(frame.data)]
+        return frame
+
+    def render_batch(self, n: int) -> 'numpy.ndarray':
+        index = self.batch_indices(n)
+        if not self._length:
+            return numpy.zeros((n, 0, 3), numpy.uint8)
+        # view every rotation as a row of the ring, then copy out one row per
+        # frame, just like render_frame
+        size = 3 * self._length
+        rotations = numpy.lib.stride_tricks.as_strided(
+            numpy.frombuffer(self._ring, numpy.uint8),
+            shape=(self._length, size), strides=(3, 1), writeable=False)
+        return rotations[-index % self._length].reshape(n, self._length, 3)
 
-    def __next__(self) -> List[ColorData]:
-        self.pixels = rotate_right(self.pixels, 1)
-        return self.pixels
+    def palette_frame(self, index: int = None) -> PaletteFrame:
+        """
+        Render a frame as a palette-indexed frame, with ``color_list`` as the
+        palette.
+
+        :param index: (optional) the number of the frame to render, if not the
+            current one
+        """
+        if index is None:
+            index = self.frame_index
+        indices = self._base.indices
+        if self._length:
+            start = -index % self._length
+            indices = indices[start:] + indices[:start]
+        return PaletteFrame(indices, self.color_list)
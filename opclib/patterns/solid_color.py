@@ -1,5 +1,6 @@
 from typing import List
 
+from ..buffer import PixelBuffer, uniform_frame
 from ..interface import StaticLightConfig
 from ..opcutil import ColorHex, ColorData, get_color
 
@@ -22,3 +23,9 @@ class SolidColor(StaticLightConfig):
 
     def pattern(self) -> List[ColorData]:
         return [self.color] * self.num_leds
+
+    def cache_key(self):
+        return self.num_leds, self.color
+
+    def encode_pattern(self) -> PixelBuffer:
+        return uniform_frame(self.color, self.num_leds)
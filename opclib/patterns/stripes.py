@@ -1,4 +1,5 @@
 from typing import List
+from ..buffer import PaletteFrame, PixelBuffer
 from ..opcutil import ColorHex, ColorData, get_color, spread, even_spread
 from ..interface import StaticLightConfig
 
@@ -27,3 +28,16 @@ class Stripes(StaticLightConfig):
             return spread(self.color_list, self.width, self.num_leds)
         else:
             return even_spread(self.color_list, self.num_leds)
+
+    def cache_key(self):
+        return self.num_leds, tuple(self.color_list), self.width
+
+    def palette_frame(self) -> PaletteFrame:
+        """
+        Render the pattern as a palette-indexed frame, with ``color_list`` as
+        the palette.
+        """
+        return PaletteFrame.spread(self.color_list, self.width, self.num_leds)
+
+    def encode_pattern(self) -> PixelBuffer:
+        return self.palette_frame().to_buffer()
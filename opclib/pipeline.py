@@ -0,0 +1,104 @@
+"""
+Module for pipelined output. A :class:`~FrameQueue` hands frames from a render
+stage to a sender stage running in another thread, so a slow send does not
+hold up rendering and a slow render does not hold up sending.
+"""
+
+import collections
+import threading
+
+from typing import Any, Optional
+
+__all__ = ['FrameQueue']
+
+
+class FrameQueue:
+    """
+    A bounded queue of frames with a configurable overflow policy.
+
+    The policy decides what happens when a frame is put into a full queue:
+
+    * ``'block'``: wait for the sender to take a frame. Every frame is shown,
+      but rendering slows to the pace of the sender.
+    * ``'drop-oldest'``: discard the oldest queued frame to make room.
+    * ``'latest'``: discard every queued frame, so the sender always gets the
+      most recent frame (latest frame wins).
+    """
+    policies = ('block', 'drop-oldest', 'latest')
+
+    maxsize: int  # maximum number of queued frames
+    policy: str  # what to do when the queue is full
+    dropped: int = 0  # frames discarded because the queue was full
+
+    def __init__(self, maxsize: int = 2, policy: str = 'latest'):
+        """
+        Initialize a new :class:`~FrameQueue`.
+
+        :param maxsize: the maximum number of queued frames
+        :param policy: one of ``'block'``, ``'drop-oldest'`` or ``'latest'``
+        :raises ValueError: if ``policy`` is unknown or ``maxsize`` is not
+            positive
+        """
+        if policy not in self.policies:
+            raise ValueError(f'{policy!r} is not a frame queue policy; '
+                             f'use one of {self.policies}')
+        if maxsize < 1:
+            raise ValueError('maxsize must be at least 1')
+
+        self.maxsize = maxsize
+        self.policy = policy
+
+        self._frames = collections.deque()
+        self._closed = False
+        self._changed = threading.Condition()
+
+    def put(self, frame: Any) -> None:
+        """
+        Queue a frame for the sender, applying the overflow policy if the
+        queue is full.
+
+        :param frame: the frame to queue
+        """
+        with self._changed:
+            if self.policy == 'latest':
+                self.dropped += len(self._frames)
+                self._frames.clear()
+            elif self.policy == 'block':
+                while len(self._frames) >= self.maxsize and not self._closed:
+                    self._changed.wait()
+            elif len(self._frames) >= self.maxsize:
+                self._frames.popleft()
+                self.dropped += 1
+
+            self._frames.append(frame)
+            self._changed.notify_all()
+
+    def get(self, timeout: float = None) -> Optional[Any]:
+        """
+        Take the oldest queued frame, waiting for one if necessary.
+
+        :param timeout: (optional) the maximum number of seconds to wait
+        :return: the frame, or None if the queue was closed or the wait timed
+            out
+        """
+        with self._changed:
+            if not self._changed.wait_for(
+                    lambda: self._frames or self._closed, timeout):
+                return None
+            if not self._frames:
+                return None
+            frame = self._frames.popleft()
+            self._changed.notify_all()
+            return frame
+
+    def close(self) -> None:
+        """
+        Wake up all waiting threads. :meth:`get` returns None once the queue
+        is closed and empty.
+        """
+        with self._changed:
+            self._closed = True
+            self._changed.notify_all()
+
+    def __len__(self) -> int:
+        return len(self._frames)
@@ -0,0 +1,180 @@
+"""
+Module for driving several OPC servers at once. A :class:`~ClientPool` keeps a
+persistent connection to each server and sends every frame to all of them
+concurrently, so a group of Fadecandy nodes renders in lockstep.
+"""
+
+import time
+
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from . import opc
+from .buffer import PixelBuffer, encode_pixels
+
+__all__ = ['ClientPool', 'PoolNode']
+
+
+class PoolNode:
+    """
+    One OPC server in a :class:`~ClientPool`, along with its send statistics.
+    """
+    server: str  # "host:port" of the server
+    start: Optional[int]  # first LED of the frame sent to this server
+    stop: Optional[int]  # LED after the last one sent to this server
+
+    sent: int = 0  # frames delivered
+    failed: int = 0  # frames which could not be delivered
+    dropped: int = 0  # frames skipped because the previous one was unsent
+    latency: float = 0.0  # duration of the most recent send (seconds)
+    total_latency: float = 0.0  # duration of all sends (seconds)
+
+    def __init__(self, server: str, start: int = None, stop: int = None,
+                 **kwargs):
+        """
+        Initialize a new :class:`~PoolNode`.
+
+        :param server: the server's address, as "host:port"
+        :param start: (optional) the first LED of the frame to send
+        :param stop: (optional) the LED after the last one to send
+        :param kwargs: keyword arguments to pass to :class:`opc.Client`
+        """
+        self.server = server
+        self.start = start
+        self.stop = stop
+
+        self.client = opc.Client(server, **kwargs)
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._pending: Optional[Future] = None
+
+    @property
+    def busy(self) -> bool:
+        """
+        Whether this node is still sending a previous frame.
+        """
+        return self._pending is not None and not self._pending.done()
+
+    @property
+    def mean_latency(self) -> float:
+        """
+        The average duration of a send to this node (seconds).
+        """
+        attempts = self.sent + self.failed
+        return self.total_latency / attempts if attempts else 0.0
+
+    def submit(self, frame: PixelBuffer, channel: int) -> bool:
+        """
+        Start sending a frame in the background, unless the previous frame is
+        still being sent.
+
+        :param frame: the frame to send; it must not be modified afterwards
+        :param channel: the channel to send the frame to
+        :return: whether the frame was accepted
+        """
+        if self.busy:
+            self.dropped += 1
+            return False
+        self._pending = self._executor.submit(self._send, frame, channel)
+        return True
+
+    def _send(self, frame: PixelBuffer, channel: int) -> bool:
+        began = time.perf_counter()
+        success = self.client.put_pixels(frame, channel)
+        self.latency = time.perf_counter() - began
+        self.total_latency += self.latency
+
+        if success:
+            self.sent += 1
+        else:
+            self.failed += 1
+        return success
+
+    def close(self) -> None:
+        """
+        Wait for the pending send, then disconnect from the server.
+        """
+        self._executor.shutdown(wait=True)
+        self.client.disconnect()
+
+    def __repr__(self):
+        return (f'<PoolNode {self.server} sent={self.sent} '
+                f'failed={self.failed} dropped={self.dropped}>')
+
+
+class ClientPool:
+    """
+    A set of OPC clients which send each frame to many servers at once.
+
+    Each server is sent to from its own thread, so a slow or unreachable
+    server never delays the others. If a server has not finished sending the
+    previous frame when a new one arrives, it skips the new frame rather than
+    queueing it, so every node keeps showing the most recent frame it could.
+
+    A :class:`~ClientPool` has the same ``put_pixels`` method as
+    :class:`opc.Client` and can be passed to :meth:`LightConfig.run`.
+    """
+    nodes: List[PoolNode]
+
+    def __init__(self, servers: Union[Iterable[str],
+                                      Dict[str, Tuple[int, int]]],
+                 **kwargs):
+        """
+        Initialize a new :class:`~ClientPool`.
+
+        :param servers: the "host:port" addresses of the servers. Every server
+            is sent the whole frame, unless ``servers`` is a dict mapping each
+            address to the ``(start, stop)`` range of LEDs it displays.
+        :param kwargs: keyword arguments to pass to :class:`opc.Client`
+        """
+        if isinstance(servers, dict):
+            self.nodes = [PoolNode(server, start, stop, **kwargs)
+                          for server, (start, stop) in servers.items()]
+        else:
+            self.nodes = [PoolNode(server, **kwargs) for server in servers]
+
+    def put_pixels(self, pixels, channel: int = 0) -> bool:
+        """
+        Send a frame to every server in the pool without waiting for the sends
+        to finish.
+
+        The frame is encoded once and each server's part of it is copied, so
+        ``pixels`` may be modified as soon as this method returns.
+
+        :param pixels: the colors to send, as accepted by
+            :meth:`opc.Client.put_pixels`
+        :param channel: the channel to send the colors to
+        :return: whether every server accepted the frame
+        """
+        if isinstance(pixels, PixelBuffer):
+            data = pixels.data
+        else:
+            data = encode_pixels(pixels)
+        num_leds = len(data) // 3
+
+        accepted = True
+        for node in self.nodes:
+            start, stop, _ = slice(node.start, node.stop).indices(num_leds)
+            frame = PixelBuffer(stop - start)
+            frame.data[:] = data[3 * start:3 * max(start, stop)]
+            accepted = node.submit(frame, channel) and accepted
+        return accepted
+
+    def wait(self, timeout: float = None) -> None:
+        """
+        Block until every server has finished sending its current frame.
+
+        :param timeout: (optional) the maximum number of seconds to wait
+        """
+        wait([node._pending for node in self.nodes if node._pending],
+             timeout=timeout)
+
+    def close(self) -> None:
+        """
+        Wait for pending sends, then drop the connections to all servers.
+        The pool cannot be used afterwards.
+        """
+        for node in self.nodes:
+            node.close()
+
+    def __repr__(self):
+        return f'<ClientPool {[node.server for node in self.nodes]}>'
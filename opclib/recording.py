@@ -0,0 +1,159 @@
+"""
+Module for recording shows. :func:`~record` renders a lighting configuration
+ahead of time into a file of ready-to-send OPC messages, which
+:class:`opclib.patterns.Playback` plays back without rendering or encoding.
+
+A recording starts with a header giving the number of LEDs, the number of
+frames and the speed they were recorded at. The frames follow, each a complete
+OPC message for channel 0 (header and pixel data) of the same size, so frame
+``i`` starts at ``RECORDING_HEADER_SIZE + i * (HEADER_SIZE + 3 * num_leds)``.
+"""
+
+import struct
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from typing import IO, Tuple
+
+from .buffer import HEADER_SIZE, encode_pixels
+from .interface import DynamicLightConfig, LightConfig
+from .opc import pack_header
+from .parallel import render_parallel
+
+__all__ = ['record']
+
+RECORDING_MAGIC = b'OPCR'
+RECORDING_VERSION = 1
+RECORDING_HEADER_FORMAT = '>4sBxxxIId'  # magic, version, LEDs, frames, speed
+RECORDING_HEADER_SIZE = struct.calcsize(RECORDING_HEADER_FORMAT)
+
+_BATCH_FRAMES = 256  # frames rendered at once when NumPy is installed
+
+
+def pack_recording_header(num_leds: int, frames: int, speed: float) -> bytes:
+    """
+    Create the header of a recording.
+
+    :param num_leds: the number of LEDs in each frame
+    :param frames: the number of frames
+    :param speed: the number of frames per second to play the frames at
+    :return: the header bytes
+    """
+    return struct.pack(RECORDING_HEADER_FORMAT, RECORDING_MAGIC,
+                       RECORDING_VERSION, num_leds, frames, speed)
+
+
+def unpack_recording_header(data: bytes) -> Tuple[int, int, float]:
+    """
+    Read the header of a recording.
+
+    :param data: the start of the recording
+    :return: the number of LEDs, the number of frames and the speed
+    :raises ValueError: if ``data`` does not start with a recording header
+    """
+    if len(data) < RECORDING_HEADER_SIZE:
+        raise ValueError('recording is too short to have a header')
+    magic, version, num_leds, frames, speed = struct.unpack_from(
+        RECORDING_HEADER_FORMAT, data)
+    if magic != RECORDING_MAGIC:
+        raise ValueError('not a recording')
+    if version != RECORDING_VERSION:
+        raise ValueError(f'unsupported recording version {version}')
+    return num_leds, frames, speed
+
+
+def record(config: LightConfig, path: str, frames: int,
+           speed: float = None, workers: int = None) -> int:
+    """
+    Render frames of a lighting configuration into a recording.
+
+    :param config: the lighting configuration to record; its frames are taken
+        as by ``next``, from wherever it currently is, and rendered in batches
+        with :meth:`~opclib.interface.LightConfig.render_batch` when NumPy is
+        installed
+    :param path: the file to write the recording to
+    :param frames: the number of frames to record; fewer are recorded if the
+        configuration runs out of frames first
+    :param speed: (optional) the number of frames per second to play the
+        recording at, if not the speed of ``config``
+    :param workers: (optional) the number of processes to render ``config``
+        with in parallel; ``config`` must then be seekable and picklable
+    :return: the number of frames recorded
+    :raises ValueError: if a frame is not ``config.num_leds`` long
+    :raises NotImplementedError: if ``workers`` is given but ``config`` can
+        only render frames in order
+    """
+    if speed is None:
+        speed = config.speed if isinstance(config, DynamicLightConfig) else 1
+    size = 3 * config.num_leds
+    header = pack_header(0, 0, size)
+
+    with open(path, 'wb') as f:
+        f.write(pack_recording_header(config.num_leds, 0, speed))
+        if workers and size:
+            recorded = _write_parallel(config, f, frames, header, workers)
+        elif numpy is not None:
+            recorded = _write_batches(config, f, frames, header)
+        else:
+            recorded = _write_frames(config, f, frames, header)
+
+        # the frame count is only known once rendering has finished
+        f.seek(0)
+        f.write(pack_recording_header(config.num_leds, recorded, speed))
+    return recorded
+
+
+def _write_frames(config: LightConfig, f: IO, frames: int,
+                  header: bytes) -> int:
+    size = 3 * config.num_leds
+    recorded = 0
+    for _ in range(frames):
+        try:
+            data = encode_pixels(next(config))
+        except StopIteration:
+            break
+        if len(data) != size:
+            raise ValueError(f'frame {recorded + 1} has {len(data) // 3} '
+                             f'LEDs, but num_leds is {config.num_leds}')
+        f.write(header)
+        f.write(data)
+        recorded += 1
+    return recorded
+
+
+def _write_batches(config: LightConfig, f: IO, frames: int,
+                   header: bytes) -> int:
+    recorded = 0
+    while recorded < frames:
+        wanted = min(_BATCH_FRAMES, frames - recorded)
+        batch = config.render_batch(wanted)
+        messages = numpy.empty((len(batch), HEADER_SIZE + 3 * config.num_leds),
+                               numpy.uint8)
+        messages[:, :HEADER_SIZE] = numpy.frombuffer(header, numpy.uint8)
+        messages[:, HEADER_SIZE:] = batch.reshape(len(batch), -1)
+        f.write(messages.tobytes())
+        recorded += len(batch)
+        if len(batch) < wanted:
+            break  # the configuration ran out of frames
+    return recorded
+
+
+def _write_parallel(config: LightConfig, f: IO, frames: int, header: bytes,
+                    workers: int) -> int:
+    size = 3 * config.num_leds
+    first = getattr(config, 'frame_index', 0) + 1
+    recorded = 0
+    for chunk in render_parallel(config, first, first + frames, workers):
+        chunk = memoryview(chunk)
+        for offset in range(0, len(chunk), size):
+            f.write(header)
+            f.write(chunk[offset:offset + size])
+        recorded += len(chunk) // size
+
+    # leave the config where recording it in order would have
+    if isinstance(config, DynamicLightConfig):
+        config.seek(first + recorded)
+    return recorded
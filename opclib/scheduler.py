@@ -0,0 +1,206 @@
+"""
+Module for driving many outputs from one thread. A :class:`~Scheduler` runs
+any number of lighting configurations, each sent to its own client and
+channel at its own speed, from a single loop.
+
+The loop keeps a heap of the outputs ordered by when each one's next frame is
+due, sleeps until the earliest deadline, then renders and sends every output
+which is due. Like :class:`~opclib.timing.FrameClock`, deadlines are absolute
+so outputs do not drift, and an output which falls behind skips the frames it
+missed rather than rushing through them.
+"""
+
+import heapq
+import inspect
+import itertools
+import time
+
+from typing import Callable, List
+
+from .interface import DynamicLightConfig, LightConfig
+
+__all__ = ['Output', 'Scheduler']
+
+
+class Output:
+    """
+    A lighting configuration sent to one channel of a client by a
+    :class:`~Scheduler`, along with its timing statistics.
+    """
+    config: LightConfig
+    client: object  # anything with put_pixels, such as an opc.Client
+    channel: int
+    rate: float  # frames per second, or None to send a single frame
+    active: bool = True  # whether the output is still scheduled
+
+    frames: int = 0  # frames sent
+    skipped: int = 0  # frames skipped because the scheduler fell behind
+    failed: int = 0  # frames the client could not deliver
+
+    def __init__(self, config: LightConfig, client, channel: int = 0,
+                 rate: float = None):
+        """
+        Initialize a new :class:`~Output`.
+
+        :param config: the lighting configuration to display
+        :param client: the client to send frames with
+        :param channel: the channel to send frames to
+        :param rate: (optional) the frames per second to send at, if not the
+            speed of ``config``; static configurations are sent once
+        :raises TypeError: if ``client`` sends frames with a coroutine, like
+            :class:`~opclib.opc.AsyncClient`
+        """
+        if inspect.iscoroutinefunction(getattr(client, 'put_pixels', None)):
+            raise TypeError(f'{type(client).__name__}.put_pixels is a '
+                            f'coroutine, which the scheduler cannot await')
+        self.config = config
+        self.client = client
+        self.channel = channel
+        if rate is None and isinstance(config, DynamicLightConfig):
+            rate = config.speed
+        self.rate = rate
+
+    def __repr__(self):
+        return (f'<Output {type(self.config).__name__} '
+                f'channel={self.channel} frames={self.frames}>')
+
+
+class Scheduler:
+    """
+    Run many lighting configurations from one loop.
+
+    Outputs are added with :meth:`add` and driven by :meth:`run`. Each frame
+    is rendered with ``next`` and sent with the client's ``put_pixels``, so
+    rendering and sending happen on the scheduler's thread; outputs sharing a
+    client should share a channel only if that is intended.
+
+    Clients must send synchronously, so :class:`~opclib.opc.AsyncClient` is
+    not supported. A blocking client such as :class:`~opclib.opc.Client`
+    stalls every output while it connects or sends, so a server which stops
+    responding delays the others by up to its connection timeout.
+    """
+    outputs: List[Output]
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Initialize a new :class:`~Scheduler`.
+
+        :param clock: a monotonic clock returning seconds
+        :param sleep: a function which sleeps for the given number of seconds
+        """
+        self.outputs = []
+        self._clock = clock
+        self._sleep = sleep
+        self._heap = []  # (deadline, order added, output)
+        self._order = itertools.count()  # breaks ties between deadlines
+        self._running = False
+
+    def add(self, config: LightConfig, client, channel: int = 0,
+            rate: float = None) -> Output:
+        """
+        Schedule a lighting configuration. Its first frame is due
+        immediately.
+
+        :param config: the lighting configuration to display
+        :param client: the client to send frames with
+        :param channel: the channel to send frames to
+        :param rate: (optional) the frames per second to send at, if not the
+            speed of ``config``
+        :return: the new output
+        :raises TypeError: if ``client`` sends frames with a coroutine
+        """
+        output = Output(config, client, channel, rate)
+        self.outputs.append(output)
+        self._push(self._clock(), output)
+        return output
+
+    def remove(self, output: Output) -> None:
+        """
+        Stop sending an output.
+
+        :param output: an output returned by :meth:`add`
+        """
+        output.active = False
+        if output in self.outputs:
+            self.outputs.remove(output)
+
+    def _push(self, deadline: float, output: Output) -> None:
+        heapq.heappush(self._heap, (deadline, next(self._order), output))
+
+    def next_deadline(self) -> float:
+        """
+        Get the time at which the next frame is due, or None if no outputs
+        are scheduled.
+        """
+        while self._heap and not self._heap[0][2].active:
+            heapq.heappop(self._heap)  # removed outputs are dropped lazily
+        return self._heap[0][0] if self._heap else None
+
+    def step(self) -> int:
+        """
+        Render and send the frame of every output which is due, without
+        waiting.
+
+        :return: the number of frames sent
+        """
+        now = self._clock()
+        sent = 0
+        while True:
+            deadline = self.next_deadline()
+            if deadline is None or deadline > now:
+                return sent
+            _, _, output = heapq.heappop(self._heap)
+            if output.frames == 0:
+                deadline = now  # the first frame sets the output's schedule
+
+            missed = 0
+            if output.rate:
+                missed = int((now - deadline) * output.rate)  # frames behind
+                if missed and isinstance(output.config, DynamicLightConfig):
+                    output.config.catch_up(missed)
+                    output.skipped += missed
+
+            try:
+                pixels = next(output.config)
+            except StopIteration:
+                self.remove(output)  # a finite configuration has ended
+                continue
+            if not output.client.put_pixels(pixels, output.channel):
+                output.failed += 1
+            output.frames += 1
+            sent += 1
+
+            if output.rate:
+                self._push(deadline + (missed + 1) / output.rate, output)
+            else:
+                self.remove(output)  # static configurations are sent once
+
+    def run(self, duration: float = None) -> None:
+        """
+        Drive every output until none remain, :meth:`stop` is called, or
+        ``duration`` seconds have passed.
+
+        :param duration: (optional) the number of seconds to run for
+        """
+        end = None if duration is None else self._clock() + duration
+        self._running = True
+        while self._running:
+            deadline = self.next_deadline()
+            if deadline is None:
+                break
+            if end is not None and deadline > end:
+                self._sleep(max(0.0, end - self._clock()))
+                break
+
+            now = self._clock()
+            if deadline > now:
+                self._sleep(deadline - now)
+            self.step()
+        self._running = False
+
+    def stop(self) -> None:
+        """
+        Make :meth:`run` return after the frames it is sending.
+        """
+        self._running = False
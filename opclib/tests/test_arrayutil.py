@@ -0,0 +1,72 @@
+import unittest
+
+from opclib import opcutil
+
+try:
+    from opclib import arrayutil
+except ImportError:
+    arrayutil = None
+
+
+@unittest.skipIf(arrayutil is None, 'NumPy is not installed')
+class TestArrayUtil(unittest.TestCase):
+    """
+    Tests for ``arrayutil`` module, against the ``opcutil`` reference.
+    """
+
+    colors = [(255, 0, 0), (0, 255, 0), (0, 0, 255)]
+
+    def assertMatches(self, array, reference):
+        self.assertEqual([tuple(v) for v in array.tolist()], reference)
+
+    def test_shift(self):
+        self.assertEqual(tuple(arrayutil.shift((0, 50, 100), (100, 100, 100),
+                                               0.5)),
+                         opcutil.shift((0, 50, 100), (100, 100, 100), 0.5))
+
+        frame = arrayutil.shift(self.colors, (100, 100, 100), [0, 0.5, 1])
+        self.assertMatches(frame, [(255, 0, 0), (50, 177.5, 50),
+                                   (100, 100, 100)])
+
+        # one amount per frame of a batch
+        batch = arrayutil.shift([self.colors] * 2, (100, 100, 100), [0, 1])
+        self.assertEqual(batch.shape, (2, 3, 3))
+        self.assertMatches(batch[0], self.colors)
+        self.assertMatches(batch[1], [(100, 100, 100)] * 3)
+
+    def test_even_spread(self):
+        for n in range(12):
+            self.assertMatches(arrayutil.even_spread(self.colors, n),
+                               opcutil.even_spread(self.colors, n))
+
+        vals = [1, 2, 1, 3]  # duplicates follow the reference exactly
+        self.assertEqual(arrayutil.even_spread(vals, 5).tolist(),
+                         opcutil.even_spread(vals, 5))
+
+        with self.assertRaises(ValueError):
+            arrayutil.even_spread([], 5)
+        with self.assertRaises(ValueError):
+            arrayutil.even_spread(self.colors, -3)
+
+    def test_spread(self):
+        for seq_length in range(1, 5):
+            for n in range(10):
+                self.assertMatches(arrayutil.spread(self.colors, seq_length, n),
+                                   opcutil.spread(self.colors, seq_length, n))
+
+        with self.assertRaises(ValueError):
+            arrayutil.spread(self.colors, 0, 6)
+
+    def test_rotate(self):
+        for n in range(-4, 5):
+            self.assertMatches(arrayutil.rotate_left(self.colors, n),
+                               opcutil.rotate_left(self.colors, n))
+            self.assertMatches(arrayutil.rotate_right(self.colors, n),
+                               opcutil.rotate_right(self.colors, n))
+
+        batch = arrayutil.rotate_right([self.colors] * 2, 1, axis=1)
+        self.assertMatches(batch[1], opcutil.rotate_right(self.colors, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import unittest
+
+from opclib import buffer
+from opclib.buffer import PaletteFrame, PixelBuffer
+
+
+class TestPixelBuffer(unittest.TestCase):
+    """
+    Tests for ``PixelBuffer``.
+    """
+
+    def test_init(self):
+        self.assertEqual(len(PixelBuffer(4)), 4)
+        self.assertListEqual(list(PixelBuffer(3)), [(0, 0, 0)] * 3)
+        self.assertEqual(PixelBuffer(2, [(1, 2, 3), (300, -4, 5.9)]),
+                         [(1, 2, 3), (255, 0, 5)])
+        self.assertEqual(len(PixelBuffer(-2)), 0)
+
+    def test_items(self):
+        frame = PixelBuffer(4)
+        frame[1] = (10, 20, 30)
+        frame[-1] = (1.5, 2.5, 256)
+        self.assertEqual(frame[1], (10, 20, 30))
+        self.assertEqual(frame[3], (1, 2, 255))
+        with self.assertRaises(IndexError):
+            frame[4]
+
+        frame[0:2] = [(7, 7, 7), (8, 8, 8)]
+        self.assertListEqual(frame[:2], [(7, 7, 7), (8, 8, 8)])
+        frame[2:] = PixelBuffer(2, [(9, 9, 9)] * 2)
+        self.assertListEqual(frame[2:], [(9, 9, 9)] * 2)
+        with self.assertRaises(ValueError):
+            frame[0:2] = [(1, 1, 1)]
+
+    def test_fill_and_copy(self):
+        frame = PixelBuffer(3)
+        frame.fill((171, 205, 239.5))
+        self.assertEqual(frame.tobytes(), bytes([171, 205, 239]) * 3)
+
+        other = frame.copy()
+        other[0] = (0, 0, 0)
+        self.assertEqual(frame[0], (171, 205, 239))
+
+    def test_message(self):
+        frame = PixelBuffer(2, [(1, 2, 3), (4, 5, 6)])
+        self.assertEqual(bytes(frame.message(5)),
+                         bytes([5, 0, 0, 6, 1, 2, 3, 4, 5, 6]))
+
+        storage = bytes(frame.message(0))
+        shared = PixelBuffer.over(storage, 2)
+        self.assertEqual(shared.message(0), storage)
+        self.assertEqual(bytes(shared.message(5)), bytes(frame.message(5)))
+        self.assertEqual(storage[0], 0)  # read-only storage is not written
+
+    def test_over(self):
+        storage = bytearray(2 * (buffer.HEADER_SIZE + 6))
+        second = PixelBuffer.over(storage, 2, buffer.HEADER_SIZE + 6)
+        second[1] = (1, 2, 3)
+        self.assertEqual(storage[-3:], bytearray([1, 2, 3]))
+        with self.assertRaises(ValueError):
+            PixelBuffer.over(storage, 3, buffer.HEADER_SIZE + 6)
+
+
+class TestPaletteFrame(unittest.TestCase):
+    """
+    Tests for ``PaletteFrame``.
+    """
+
+    def test_encode(self):
+        colors = [(1, 2, 3), (4, 5, 6.5), (1, 2, 3), (300, 0, 0)]
+        frame = PaletteFrame.from_colors(colors)
+        self.assertEqual(frame.palette, [(1, 2, 3), (4, 5, 6.5), (300, 0, 0)])
+        self.assertEqual(list(frame.indices), [0, 1, 0, 2])
+        self.assertEqual(list(frame), colors)
+        self.assertEqual(frame.encode(), buffer.encode_pixels(colors))
+        self.assertEqual(frame.to_buffer(), PixelBuffer(4, colors))
+
+        frame.palette[0] = (9, 9, 9)  # recolors every pixel using it
+        self.assertEqual(frame.encode()[:9], bytes([9, 9, 9, 4, 5, 6, 9, 9, 9]))
+
+        lut = buffer.color_lut(brightness=0.5)
+        self.assertEqual(frame.encode(lut),
+                         buffer.encode_pixels(list(frame), lut))
+
+    def test_spread(self):
+        red, green = (255, 0, 0), (0, 255, 0)
+        frame = PaletteFrame.spread([red, green, red], 2, 8)
+        self.assertEqual(frame.palette, [red, green, red])
+        self.assertEqual(list(frame.indices), [0, 0, 1, 1, 0, 0, 0, 0])
+        self.assertEqual(list(PaletteFrame.spread([red, green], None, 4)),
+                         [red, red, green, green])
+
+    def test_large_palette(self):
+        palette = [(i % 256, i // 256, 0) for i in range(300)]
+        frame = PaletteFrame([299, 0, 256], palette)
+        self.assertEqual(frame.indices.typecode, 'H')
+        self.assertEqual(frame.encode(), bytes([43, 1, 0, 0, 0, 0, 0, 1, 0]))
+
+        with self.assertRaises(ValueError):
+            PaletteFrame([3], palette[:3])
+
+
+class TestLerpFrames(unittest.TestCase):
+    """
+    Tests for ``lerp_frames``.
+    """
+
+    def test_lerp_frames(self):
+        a = PixelBuffer(2, [(0, 100, 255), (10, 10, 10)])
+        b = PixelBuffer(2, [(255, 0, 255), (11, 11, 11)])
+        self.assertEqual(buffer.lerp_frames(a, b, 0), a)
+        self.assertEqual(buffer.lerp_frames(a, b, 1), b)
+        self.assertEqual(buffer.lerp_frames(a, b, 0.5),
+                         [(127, 50, 255), (10, 10, 10)])
+        with self.assertRaises(ValueError):
+            buffer.lerp_frames(a, PixelBuffer(3), 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+import unittest
+
+from opclib.bus import FrameBus, run_bus, shared_memory
+from opclib.interface import DynamicLightConfig
+from opclib.patterns import SolidColor
+
+
+class Countdown(DynamicLightConfig):
+    """
+    A finite config whose frames show how many frames are left.
+    """
+    speed = 100
+    seekable = True
+
+    def __init__(self, frames, **kwargs):
+        super().__init__(**kwargs)
+        self.frames = frames
+
+    def render_frame(self, index):
+        if index > self.frames:
+            raise StopIteration
+        return [(self.frames - index,) * 3] * self.num_leds
+
+
+class Broken(Countdown):
+    """
+    A config which fails on its third frame.
+    """
+
+    def render_frame(self, index):
+        if index == 3:
+            raise RuntimeError('render failed')
+        return super().render_frame(index)
+
+
+class RecordingClient:
+    """
+    A stand-in for ``opc.Client`` which remembers what it was sent.
+    """
+
+    def __init__(self):
+        self.sent = []
+
+    def put_frames(self, frames):
+        self.sent.append({channel: list(frame)
+                          for channel, frame in frames.items()})
+        return True
+
+
+class PixelsClient:
+    """
+    A stand-in for ``ClientPool``, which only has ``put_pixels``.
+    """
+
+    def __init__(self):
+        self.sent = {}
+
+    def put_pixels(self, pixels, channel=0):
+        self.sent[channel] = list(pixels)
+        return True
+
+
+@unittest.skipIf(shared_memory is None, 'shared memory is not available')
+class TestFrameBus(unittest.TestCase):
+    """
+    Tests for ``FrameBus``.
+    """
+
+    def setUp(self):
+        self.bus = FrameBus([2, 1])
+
+    def tearDown(self):
+        self.bus.close()
+        self.bus.unlink()
+
+    def test_read_write(self):
+        self.assertEqual(self.bus.sequence(0), 0)
+        self.assertEqual(self.bus.write(0, [(1, 2, 3), (4, 5, 6)]), 1)
+        self.assertEqual(self.bus.write(1, [(7, 8, 9)]), 1)
+        self.assertEqual(self.bus.write(0, [(9, 9, 9)] * 2), 2)
+
+        other = FrameBus.attach(self.bus.name, self.bus._locks)
+        self.assertEqual(other.num_leds, [2, 1])
+        frame, pixels = other.read(0)
+        self.assertEqual((frame, list(pixels)), (2, [(9, 9, 9)] * 2))
+        self.assertEqual(list(other.read(1)[1]), [(7, 8, 9)])
+
+        other.stop()
+        self.assertTrue(self.bus.stopped)
+        other.close()
+        self.assertEqual(list(pixels), [(9, 9, 9)] * 2)  # a private copy
+
+    def test_double_buffering(self):
+        self.bus.write(1, [(1, 1, 1)])
+        # a half-written next frame goes to the other buffer
+        sequence = self.bus._field(1, 1)
+        self.bus._fields[sequence] += 1
+        self.bus._buffers[1][0].data[:] = bytes(3)
+        self.assertEqual(self.bus.read(1), (1, [(1, 1, 1)]))
+
+    def test_render(self):
+        self.bus.render(1, SolidColor('#010203', num_leds=1))
+        self.assertTrue(self.bus.done(1))
+        self.assertFalse(self.bus.done(0))
+        self.bus.render(0, Countdown(3, num_leds=2))
+        self.assertEqual(self.bus.read(0), (3, [(0, 0, 0)] * 2))
+
+    def test_render_failure(self):
+        self.bus.render(1, SolidColor('#010203', num_leds=1))
+        with self.assertRaisesRegex(RuntimeError, 'render failed'):
+            self.bus.render(0, Broken(5, num_leds=2))
+        self.assertTrue(self.bus.failed(0))
+        self.assertFalse(self.bus.done(0))
+
+        # seen by the sender even without the worker processes
+        with self.assertRaisesRegex(RuntimeError, 'slot 0 failed'):
+            self.bus.send(RecordingClient(), 100)
+
+
+@unittest.skipIf(shared_memory is None, 'shared memory is not available')
+class TestRunBus(unittest.TestCase):
+    """
+    Tests for ``run_bus``.
+    """
+
+    def test_run_bus(self):
+        client = RecordingClient()
+        run_bus([Countdown(5, num_leds=2), SolidColor('#010203', num_leds=1)],
+                client, channels={0: 4, 1: 7})
+        sent = {}
+        for frames in client.sent:
+            sent.update(frames)
+        self.assertEqual(sent, {4: [(0, 0, 0)] * 2, 7: [(1, 2, 3)]})
+
+    def test_put_pixels(self):
+        client = PixelsClient()
+        run_bus([Countdown(5, num_leds=2)], client)
+        self.assertEqual(client.sent, {1: [(0, 0, 0)] * 2})
+
+    def test_worker_failure(self):
+        with self.assertRaisesRegex(RuntimeError, 'slot 1 (failed|exited)'):
+            run_bus([Countdown(5, num_leds=1), Broken(5, num_leds=1)],
+                    RecordingClient())
@@ -0,0 +1,59 @@
+import unittest
+
+from opclib.interface import DynamicLightConfig
+from opclib.tests.test_timing import FakeClock
+from opclib.timing import FrameClock
+
+
+class TestDynamicLightConfig(unittest.TestCase):
+    """
+    Tests for ``DynamicLightConfig``.
+    """
+
+    def test_abstract(self):
+        class Empty(DynamicLightConfig):
+            speed = 10
+
+        class Stepped(Empty):
+            def __next__(self):
+                return []
+
+        class Seekable(Empty):
+            def render_frame(self, index):
+                return [(index, 0, 0)]
+
+        with self.assertRaisesRegex(TypeError, '__next__ or render_frame'):
+            Empty()
+        self.assertEqual(next(Stepped()), [])
+        self.assertEqual(next(Seekable()), [(1, 0, 0)])
+
+    def test_catch_up(self):
+        time = FakeClock()
+        sent = []
+
+        class Slow(DynamicLightConfig):
+            speed = 10
+
+            def __next__(self):
+                if self.frame_index == 30:
+                    raise StopIteration
+                time.now += 0.12  # longer than a frame is shown for
+                self.frame_index += 1
+                return [(self.frame_index, 0, 0)]
+
+        class Client:
+            def put_pixels(self, pixels, channel=0):
+                sent.append(pixels[0][0])
+                return True
+
+        clock = FrameClock(10, clock=time, sleep=time.sleep)
+        Slow().run(client=Client(), clock=clock)
+
+        # missed deadlines are coalesced, not rendered and thrown away
+        self.assertEqual(sent, list(range(1, 31)))
+        self.assertLessEqual(clock.skipped, clock.frames // 5 + 1)
+        self.assertAlmostEqual(time.now, 100 + 30 * 0.12)
+
+
+if __name__ == '__main__':
+    unittest.main()
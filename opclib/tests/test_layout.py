@@ -0,0 +1,61 @@
+import io
+import json
+import unittest
+
+try:
+    from opclib import layout
+    import numpy
+except ImportError:
+    layout = None
+
+
+@unittest.skipIf(layout is None, 'NumPy is not installed')
+class TestLayout(unittest.TestCase):
+    """
+    Tests for ``layout`` module.
+    """
+
+    def test_grid_order(self):
+        self.assertEqual(layout.grid_order(3, 2).tolist(), [0, 1, 2, 3, 4, 5])
+        self.assertEqual(layout.grid_order(3, 2, serpentine=True).tolist(),
+                         [0, 1, 2, 5, 4, 3])
+        self.assertEqual(layout.grid_order(0, 4).tolist(), [])
+        self.assertRaises(ValueError, layout.grid_order, -1, 2)
+
+    def test_grid(self):
+        grid = layout.Layout.grid(2, 2, serpentine=True, spacing=0.5)
+        self.assertEqual(len(grid), 4)
+        self.assertEqual(grid.x.tolist(), [0, 0.5, 0.5, 0])
+        self.assertEqual(grid.y.tolist(), [0, 0, 0.5, 0.5])
+        self.assertEqual(grid.z.tolist(), [0] * 4)
+        self.assertFalse(grid.points.flags.writeable)
+
+    def test_load(self):
+        points = [[0, 0, 0], [1, 2, 0], [2, 4, 1]]
+        entries = [{'point': p} for p in points]
+        loaded = layout.Layout.load(io.StringIO(json.dumps(entries)))
+        self.assertEqual(loaded.points.tolist(), points)
+        self.assertEqual(loaded.normalized().y.tolist(), [0, 0.5, 1])
+        self.assertEqual(loaded.reorder([2, 0]).x.tolist(), [2, 0])
+
+        self.assertRaises(ValueError, layout.Layout.load,
+                          io.StringIO(json.dumps([{'point': [0, 0]}, {}])))
+        self.assertRaises(ValueError, layout.Layout, [[0], [1]])
+        self.assertEqual(len(layout.Layout([])), 0)
+
+    def test_field(self):
+        from opclib.patterns import Field
+
+        def gradient(x, y, t):
+            return numpy.stack([x * 100 + t, y * 100, 0 * x], axis=-1)
+
+        field = Field(gradient, layout.Layout.grid(2, 2), speed=10)
+        self.assertEqual(field.num_leds, 4)
+        self.assertEqual(list(field.render_frame(0)),
+                         [(0, 0, 0), (100, 0, 0), (0, 100, 0), (100, 100, 0)])
+        self.assertEqual(next(field)[1], (100, 0, 0))  # t = 0.1
+        self.assertEqual(list(Field(lambda x, y, t: (1, 2, 3),
+                                    layout.Layout.grid(1, 2)).render_frame(0)),
+                         [(1, 2, 3)] * 2)
+        self.assertRaises(ValueError, Field, gradient,
+                          layout.Layout.grid(2, 2), num_leds=5)
@@ -0,0 +1,207 @@
+import asyncio
+import socket
+import struct
+import unittest
+
+from opclib import opc
+from opclib.buffer import PixelBuffer
+
+
+def reference_message(pixels, channel=0):
+    """
+    The original per-pixel encoding of ``opc.Client.put_pixels``.
+    """
+    header = struct.pack('BBBB', channel, 0, len(pixels) * 3 // 256,
+                         (len(pixels) * 3) % 256)
+    return header + b''.join(struct.pack('BBB',
+                                         min(255, max(0, int(r))),
+                                         min(255, max(0, int(g))),
+                                         min(255, max(0, int(b))))
+                             for r, g, b in pixels)
+
+
+class ServerTestCase(unittest.TestCase):
+    """
+    Base class for tests which need a listening OPC server.
+    """
+
+    def setUp(self):
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.bind(('127.0.0.1', 0))
+        self.server.listen(1)
+        self.address = '127.0.0.1:%d' % self.server.getsockname()[1]
+        self.conn = None
+
+    def tearDown(self):
+        if self.conn:
+            self.conn.close()
+        self.server.close()
+
+    def receive(self, n):
+        if self.conn is None:
+            self.conn, _ = self.server.accept()
+            self.conn.settimeout(2)
+        data = b''
+        while len(data) < n:
+            data += self.conn.recv(n - len(data))
+        return data
+
+
+class TestEncoding(unittest.TestCase):
+    """
+    Tests for OPC frame encoding.
+    """
+
+    pixels = [(0, 0, 0), (255, 255, 255), (127.9, 0.5, 254.99),
+              (-20, 300, 12), (-0.5, 255.5, 1e6)]
+
+    def test_encode_pixels(self):
+        self.assertEqual(opc.encode_pixels(self.pixels),
+                         reference_message(self.pixels)[4:])
+        self.assertEqual(opc.encode_pixels([]), b'')
+
+    def test_color_lut(self):
+        self.assertIsNone(opc.color_lut())
+        half = opc.color_lut(brightness=0.5)
+        self.assertEqual((half[0], half[100], half[255]), (0, 50, 128))
+        gamma = opc.color_lut(gamma=2.0)
+        self.assertEqual((gamma[0], gamma[128], gamma[255]), (0, 64, 255))
+
+        lut = opc.color_lut(0.8, 2.2)
+        expected = reference_message(self.pixels)[4:].translate(lut)
+        self.assertEqual(opc.encode_pixels(self.pixels, lut), expected)
+        self.assertEqual(opc.encode_pixels(PixelBuffer(5, self.pixels), lut),
+                         expected)
+
+    def test_pack_header(self):
+        for n in (0, 1, 85, 86, 512, 21845):
+            self.assertEqual(opc.pack_header(7, 0, n * 3),
+                             reference_message([(0, 0, 0)] * n, 7)[:4])
+
+
+class TestClient(ServerTestCase):
+    """
+    Tests for ``opc.Client``.
+    """
+
+    def test_put_pixels(self):
+        client = opc.Client(self.address)
+        pixels = TestEncoding.pixels * 120
+        self.assertTrue(client.put_pixels(pixels, channel=3))
+        expected = reference_message(pixels, 3)
+        self.assertEqual(self.receive(len(expected)), expected)
+        client.disconnect()
+
+    def test_put_pixel_buffer(self):
+        client = opc.Client(self.address)
+        pixels = TestEncoding.pixels * 3
+        self.assertTrue(client.put_pixels(PixelBuffer(15, pixels), channel=2))
+        expected = reference_message(pixels, 2)
+        self.assertEqual(self.receive(len(expected)), expected)
+        client.disconnect()
+
+    def test_put_frames(self):
+        client = opc.Client(self.address)
+        frame = PixelBuffer(2, [(1, 2, 3), (4, 5, 6)])
+        pixels = [(7, 8, 9)] * 3
+        self.assertTrue(client.put_frames({1: frame, 2: pixels, 3: frame}))
+        expected = (reference_message(frame, 1)
+                    + reference_message(pixels, 2)
+                    + reference_message(frame, 3))
+        self.assertEqual(self.receive(len(expected)), expected)
+        client.disconnect()
+
+    def test_frame_messages(self):
+        pixels = [(7, 8, 9)] * 3
+        parts = opc.frame_messages({1: pixels, 2: pixels})
+        self.assertEqual(len(parts), 4)
+        self.assertIs(parts[1], parts[3])  # encoded once, mirrored
+
+    def test_backoff(self):
+        self.server.close()
+        client = opc.Client(self.address, min_backoff=60)
+        self.assertFalse(client.put_pixels([(1, 2, 3)]))
+        self.assertEqual(client.state, 'backoff')
+
+        # no further connection attempts while backing off
+        for _ in range(10):
+            self.assertFalse(client.put_pixels([(1, 2, 3)]))
+        self.assertEqual(client.reconnect_attempts, 1)
+        self.assertEqual(client.dropped_frames, 11)
+
+        # frames are dropped before being encoded, so even pixels which could
+        # not be encoded are simply dropped
+        self.assertFalse(client.put_pixels([('not a color',)]))
+        self.assertFalse(client.put_frames({1: [('not a color',)]}))
+        self.assertEqual(client.dropped_frames, 13)
+
+        self.assertFalse(client.can_connect())  # forces an attempt
+        self.assertEqual(client.reconnect_attempts, 2)
+
+    def test_brightness(self):
+        client = opc.Client(self.address, brightness=0.5)
+        frame = PixelBuffer(1, [(100, 200, 255)])
+        client.put_pixels(frame)
+        client.brightness = 1.0
+        client.put_frames({1: frame})
+        expected = bytes([0, 0, 0, 3, 50, 100, 128, 1, 0, 0, 3, 100, 200, 255])
+        self.assertEqual(self.receive(len(expected)), expected)
+        self.assertEqual(frame[0], (100, 200, 255))  # unchanged
+        client.disconnect()
+
+    def test_suppress_duplicates(self):
+        client = opc.Client(self.address, suppress_duplicates=True,
+                            keepalive=60)
+        frame = PixelBuffer(2, [(1, 2, 3)] * 2)
+        for _ in range(3):
+            self.assertTrue(client.put_pixels(frame, channel=1))
+        self.assertEqual(client.suppressed_frames, 2)
+        self.assertEqual(client.suppressed_bytes, 20)
+
+        frame[0] = (4, 5, 6)
+        self.assertTrue(client.put_frames({1: frame, 2: [(7, 8, 9)]}))
+        self.assertTrue(client.put_frames({1: frame, 2: [(7, 8, 9)]}))
+        self.assertEqual(client.suppressed_frames, 3)
+
+        expected = (reference_message([(1, 2, 3)] * 2, 1)
+                    + reference_message(frame, 1)
+                    + reference_message([(7, 8, 9)], 2))
+        self.assertEqual(self.receive(len(expected)), expected)
+
+        client._keepalive = 0  # every frame is now due for a keep-alive
+        self.assertTrue(client.put_pixels([(7, 8, 9)], channel=2))
+        expected = reference_message([(7, 8, 9)], 2)
+        self.assertEqual(self.receive(len(expected)), expected)
+        client.disconnect()
+
+
+class TestAsyncClient(ServerTestCase):
+    """
+    Tests for ``opc.AsyncClient``.
+    """
+
+    def test_put_pixels(self):
+        client = opc.AsyncClient(self.address)
+        pixels = TestEncoding.pixels * 4
+
+        async def go():
+            sent = await asyncio.gather(client.put_pixels(pixels, 1),
+                                        client.set_interpolation(False),
+                                        client.put_frames({2: pixels}))
+            client.disconnect()
+            return sent
+
+        self.assertEqual(asyncio.run(go()), [True, True, True])
+        expected = (reference_message(pixels, 1)
+                    + bytes([0, 255, 0, 5, 0, 1, 0, 2, 2])
+                    + reference_message(pixels, 2))
+        self.assertEqual(self.receive(len(expected)), expected)
+
+    def test_not_connected(self):
+        self.server.close()
+        client = opc.AsyncClient(self.address)
+        self.assertFalse(asyncio.run(client.put_pixels([(1, 2, 3)])))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import os
+import pickle
+import tempfile
+import unittest
+
+from opclib.buffer import encode_pixels
+from opclib.parallel import render_chunk, render_parallel
+from opclib.patterns import Fade, Playback, Scroll, SolidColor
+from opclib.patterns.modifiers import Strobe
+from opclib.recording import record
+
+
+def sequential(config, n):
+    return b''.join(encode_pixels(next(config)) for _ in range(n))
+
+
+class TestParallel(unittest.TestCase):
+    """
+    Tests for ``render_chunk`` and ``render_parallel``.
+    """
+
+    def test_render_chunk(self):
+        fade = Fade(['#FF0000', '#0000FF'], num_leds=3)
+        expected = sequential(Fade(['#FF0000', '#0000FF'], num_leds=3), 30)
+        self.assertEqual(render_chunk(fade, 11, 31), expected[3 * 3 * 10:])
+        self.assertEqual(encode_pixels(next(fade)),
+                         encode_pixels(fade.render_frame(31)))
+        self.assertEqual(render_chunk(SolidColor('#010203', num_leds=2), 5, 7),
+                         bytes([1, 2, 3] * 4))
+
+    def test_render_parallel(self):
+        strobe = Strobe(Scroll(['#FF0000', '#00FF00', '#0000FF'], num_leds=4))
+        strobe.render_frame(1)  # cached frames must survive pickling
+        chunks = list(render_parallel(strobe, 1, 101, workers=2,
+                                      chunk_frames=7))
+        self.assertEqual(len(chunks), 15)
+        self.assertEqual(b''.join(chunks), sequential(strobe, 100))
+
+    def test_not_seekable(self):
+        scroll = Scroll(['#FF0000'], num_leds=2)
+        scroll.seekable = False
+        self.assertRaises(NotImplementedError, next,
+                          render_parallel(scroll, 1, 10))
+
+    def test_record(self):
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            fade = Fade(['#FF0000', '#0000FF'], num_leds=3)
+            self.assertEqual(record(fade, path, 50, workers=2), 50)
+            self.assertEqual(fade.frame_index, 50)
+
+            playback = pickle.loads(pickle.dumps(Playback(path)))
+            reference = Fade(['#FF0000', '#0000FF'], num_leds=3)
+            self.assertEqual(sequential(playback, 50),
+                             sequential(reference, 50))
+        finally:
+            os.remove(path)
@@ -1,6 +1,16 @@
+import copy
 import unittest
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from opclib.buffer import encode_pixels
+from opclib.opcutil import shift
 from opclib.patterns import *
+from opclib.patterns.modifiers import (Cache, Composite, Interpolate,
+                                       Segments, Strobe)
 
 
 # -------------------------------
@@ -29,6 +39,23 @@ class TestSolidColor(unittest.TestCase):
         sc4 = SolidColor('#00FF16', num_leds=-5)
         self.assertListEqual(sc4.pattern(), [])
 
+    def test_frame(self):
+        sc = SolidColor('#ABCDEF', num_leds=4)
+        frame = sc.frame()
+        self.assertEqual(frame.tobytes(), bytes([171, 205, 239]) * 4)
+
+        # frames are copies, so changing one affects nothing else
+        frame[0] = (0, 0, 255)
+        frame.message(channel=3)
+        self.assertEqual(next(sc), [(171, 205, 239)] * 4)
+        self.assertEqual(next(SolidColor('#ABCDEF', num_leds=4)),
+                         [(171, 205, 239)] * 4)
+        self.assertEqual(next(Fade(['#ABCDEF'], num_leds=4)),
+                         [(171, 205, 239)] * 4)
+
+        sc.num_leds = 2
+        self.assertEqual(next(sc), [(171, 205, 239)] * 2)
+
 
 class TestOff(unittest.TestCase):
     """
@@ -85,6 +112,14 @@ class TestStripes(unittest.TestCase):
                              [*[(255, 0, 0)] * 4,
                               *[(0, 255, 0)] * 2])
 
+        self.assertEqual(list(stripes5.palette_frame()), stripes5.pattern())
+        stripes_frame = stripes5.frame()
+        self.assertEqual(stripes_frame, stripes5.pattern())
+        stripes_frame[0] = (1, 1, 1)
+        self.assertEqual(stripes5.frame(), stripes5.pattern())
+        stripes5.color_list[0] = (1, 2, 3)
+        self.assertEqual(stripes5.frame()[0], (1, 2, 3))
+
         stripes6 = Stripes(['#FF0000', '#00FF00', '#0000FF'], width=2,
                            num_leds=9)
         self.assertListEqual(stripes6.pattern(),
@@ -120,6 +155,23 @@ class TestFade(unittest.TestCase):
         #     self.assertListEqual(next(fade1), [(r, 0, 0)] * 10)
         #     r += 10
 
+    def test_render_frame(self):
+        fade = Fade(['#000000', '#640000', '#12AB34'], num_leds=3)
+        color = fade.color_list[0]
+        for index in range(1, 100):
+            target = fade.color_list[(index // 10) % 3]
+            color = shift(color, target, 0.1)
+            # frames hold whole values; round off floating point error, as
+            # render_frame does, before truncating
+            self.assertEqual(next(fade)[0],
+                             tuple(int(round(v, 6)) for v in color))
+
+        self.assertEqual(fade.render_frame(42), fade.render_frame(42))
+        self.assertEqual(fade.frame_index, 99)
+
+        solid = Fade(['#ABCDEF'], num_leds=2)
+        self.assertEqual(solid.render_frame(12345), [(171, 205, 239)] * 2)
+
 
 class TestScroll(unittest.TestCase):
     """
@@ -136,12 +188,255 @@ class TestScroll(unittest.TestCase):
                              [(255, 0, 0), (255, 0, 0),
                               (0, 255, 0), (0, 255, 0),
                               (0, 0, 255), (0, 0, 255)])
-        self.assertListEqual(next(scroll1),
+        self.assertListEqual(list(next(scroll1)),
                              [(0, 0, 255),
                               (255, 0, 0), (255, 0, 0),
                               (0, 255, 0), (0, 255, 0),
                               (0, 0, 255)])
-        self.assertListEqual(next(scroll1),
+        self.assertListEqual(list(next(scroll1)),
                              [(0, 0, 255), (0, 0, 255),
                               (255, 0, 0), (255, 0, 0),
                               (0, 255, 0), (0, 255, 0)])
+
+    def test_render_frame(self):
+        scroll = Scroll(['#FF0000', '#00FF00', '#0000FF'], num_leds=6,
+                        speed=2)
+        self.assertEqual(scroll.render_frame(8), scroll.render_frame(2))
+        self.assertEqual(scroll.render(1.0), scroll.render_frame(2))
+        self.assertEqual(scroll.render_frame(1), scroll.pixels[5:] +
+                         scroll.pixels[:5])
+
+        self.assertEqual(scroll.palette_frame(3).to_buffer(),
+                         scroll.render_frame(3))
+
+        scroll.seek(4)
+        self.assertEqual(next(scroll), scroll.render_frame(4))
+        scroll.skip(3)
+        self.assertEqual(next(scroll), scroll.render_frame(8))
+
+
+# -------------------------------
+# Modifiers
+# -------------------------------
+
+class TestStrobe(unittest.TestCase):
+    """
+    Tests for ``Strobe`` modifier.
+    """
+
+    def test_next(self):
+        scroll = Scroll(['#FF0000', '#00FF00'], num_leds=2)
+        strobe = Strobe(scroll, strobe_speed=2)
+        self.assertEqual(strobe.num_leds, 2)
+        self.assertEqual(next(strobe), scroll.render_frame(1))
+        self.assertEqual(next(strobe), [(0, 0, 0)] * 2)
+        self.assertEqual(next(strobe), scroll.render_frame(3))
+
+    def test_render_frame(self):
+        strobe = Strobe(Scroll(['#FF0000', '#00FF00'], num_leds=2),
+                        strobe_speed=3)
+        frames = [next(strobe) for _ in range(7)]
+        self.assertEqual([strobe.render_frame(i) for i in range(1, 8)],
+                         frames)
+
+
+class TestCache(unittest.TestCase):
+    """
+    Tests for ``Cache`` modifier.
+    """
+
+    def test_next(self):
+        scroll = Scroll(['#FF0000', '#00FF00', '#0000FF'], num_leds=6)
+        cache = Cache(Scroll(['#FF0000', '#00FF00', '#0000FF'], num_leds=6))
+        self.assertEqual(cache.period, 6)
+
+        for index in range(1, 30):
+            self.assertEqual(next(cache), next(scroll))
+            if index == 12:
+                # two identical periods have been seen
+                self.assertTrue(cache.cached)
+        self.assertEqual(cache.cycle_start, 7)
+
+        next(cache).fill((1, 2, 3))  # frames do not share the cache's slots
+        cache.render_frame(31).fill((1, 2, 3))
+        self.assertEqual(cache.render_frame(31), scroll.render_frame(31))
+        self.assertEqual(cache.render_frame(36), scroll.render_frame(36))
+
+    def test_declared_period(self):
+        scroll = Scroll(['#FF0000', '#00FF00', '#0000FF'], num_leds=6)
+        scroll.seekable = False  # force rendering in order
+        cache = Cache(scroll, period=6)
+        for _ in range(6):
+            next(cache)
+        self.assertTrue(cache.cached)  # one period is enough
+        self.assertEqual(cache.cycle_start, 1)
+        self.assertEqual(next(cache), Scroll(['#FF0000', '#00FF00', '#0000FF'],
+                                             num_leds=6).render_frame(7))
+        self.assertEqual(scroll.frame_index, 6)  # not rendered again
+
+    def test_eventually_periodic(self):
+        fade = Fade(['#000000', '#FF8000'], num_leds=4)
+        cache = Cache(Fade(['#000000', '#FF8000'], num_leds=4))
+        for _ in range(400):
+            self.assertEqual(next(cache).tobytes(), encode_pixels(next(fade)))
+        self.assertTrue(cache.cached)
+
+    def test_uncacheable(self):
+        cache = Cache(Scroll(['#FF0000', '#00FF00'], num_leds=100),
+                      max_bytes=1000)
+        for _ in range(300):
+            next(cache)
+        self.assertFalse(cache.cached)
+
+
+class TestInterpolate(unittest.TestCase):
+    """
+    Tests for ``Interpolate`` modifier.
+    """
+
+    def test_render_frame(self):
+        scroll = Scroll(['#000000', '#C8C8C8'], num_leds=2, speed=1)
+        smooth = Interpolate(scroll, rate=4)
+        self.assertEqual(smooth.speed, 4)
+        self.assertEqual(smooth.period, 8)
+
+        self.assertEqual(smooth.render_frame(0), scroll.render_frame(0))
+        self.assertEqual(smooth.render_frame(4), scroll.render_frame(1))
+        self.assertEqual(next(smooth), [(50, 50, 50), (150, 150, 150)])
+        self.assertEqual(next(smooth), [(100, 100, 100)] * 2)
+
+    def test_next(self):
+        strobe = Strobe(SolidColor('#C8C8C8', num_leds=1), strobe_speed=2)
+        strobe._config.seekable = False  # force rendering in order
+        smooth = Interpolate(strobe, rate=20)  # 2 frames per keyframe
+        self.assertFalse(smooth.seekable)
+        self.assertEqual([next(smooth)[0] for _ in range(4)],
+                         [(100, 100, 100), (0, 0, 0),
+                          (100, 100, 100), (200, 200, 200)])
+        self.assertRaises(NotImplementedError, smooth.render_frame, 1)
+        self.assertRaises(NotImplementedError, smooth._keyframe, 1)
+
+
+class TestComposite(unittest.TestCase):
+    """
+    Tests for ``Composite`` modifier.
+    """
+
+    def test_blend_modes(self):
+        base = SolidColor('#646464', num_leds=2)
+        top = Stripes(['#C8C8C8', '#000000'], num_leds=2)
+        self.assertEqual(next(Composite([base, top])), [(200, 200, 200),
+                                                        (0, 0, 0)])
+        self.assertEqual(next(Composite([base, (top, 0.5)])),
+                         [(150, 150, 150), (50, 50, 50)])
+        self.assertEqual(next(Composite([base, (top, 1, 'add')])),
+                         [(255, 255, 255), (100, 100, 100)])
+        self.assertEqual(next(Composite([base, (top, 1, 'multiply')])),
+                         [(78, 78, 78), (0, 0, 0)])
+        self.assertEqual(next(Composite([base, (top, 1, 'max')])),
+                         [(200, 200, 200), (100, 100, 100)])
+
+    def test_bad_layers(self):
+        base = SolidColor('#646464', num_leds=2)
+        self.assertRaises(ValueError, Composite, [])
+        self.assertRaises(ValueError, Composite, [(base, 1, 'screen')])
+        self.assertRaises(ValueError, Composite,
+                          [base, SolidColor('#646464', num_leds=3)])
+
+    def test_speeds(self):
+        fast = Scroll(['#C8C8C8', '#000000'], num_leds=2, speed=4)
+        slow = Scroll(['#000000', '#646464'], num_leds=2, speed=2)
+        slow.seekable = False  # force rendering in order
+        composite = Composite([(slow, 1, 'add'), (fast, 1, 'add')])
+        self.assertEqual(composite.speed, 4)
+        self.assertFalse(composite.seekable)
+        self.assertEqual(composite.period, 4)
+
+        frames = [list(next(composite)) for _ in range(4)]
+        self.assertEqual(frames, [[(100, 100, 100), (200, 200, 200)],
+                                  [(255, 255, 255), (0, 0, 0)],
+                                  [(0, 0, 0), (255, 255, 255)],
+                                  [(200, 200, 200), (100, 100, 100)]])
+
+
+class TestSegments(unittest.TestCase):
+    """
+    Tests for ``Segments`` modifier.
+    """
+
+    def test_segments(self):
+        scroll = Scroll(['#C8C8C8', '#000000'], num_leds=2, speed=4)
+        fade = Fade(['#646464', '#000000'], num_leds=1, speed=2)
+        segments = Segments([(3, fade), (0, scroll)], num_leds=5)
+        self.assertEqual(segments.speed, 4)
+        self.assertTrue(segments.seekable)
+
+        first = next(segments)
+        self.assertEqual(first[:2], list(scroll.render_frame(1)))
+        self.assertEqual(first[2], (0, 0, 0))
+        self.assertEqual(first[3], fade.render_frame(1)[0])
+
+        second = next(segments)
+        self.assertIs(second, first)  # drawn into the same frame
+        self.assertEqual(second[:2], list(scroll.render_frame(2)))
+        self.assertEqual(second[3], fade.render_frame(1)[0])
+
+    def test_render_frame(self):
+        scroll = Scroll(['#C8C8C8', '#000000'], num_leds=2, speed=1)
+        segments = Segments([(0, scroll)])
+        first, second = segments.render_frame(0), segments.render_frame(1)
+        self.assertEqual(first, [(200, 200, 200), (0, 0, 0)])
+        self.assertEqual(second, [(0, 0, 0), (200, 200, 200)])
+
+        smooth = Interpolate(Segments([(0, scroll)]), rate=4)
+        self.assertEqual(next(smooth), [(150, 150, 150), (50, 50, 50)])
+        self.assertEqual(next(smooth), [(100, 100, 100)] * 2)
+
+    def test_bad_segments(self):
+        solid = SolidColor('#646464', num_leds=2)
+        self.assertRaises(ValueError, Segments, [])
+        self.assertRaises(ValueError, Segments, [(0, solid), (1, solid)])
+        self.assertRaises(ValueError, Segments, [(0, solid)], num_leds=1)
+
+
+@unittest.skipIf(numpy is None, 'NumPy is not installed')
+class TestRenderBatch(unittest.TestCase):
+    """
+    Tests for ``render_batch``, against frames from ``next``.
+    """
+
+    def assertBatchMatches(self, config, n):
+        reference = copy.deepcopy(config)
+        batch = config.render_batch(n)
+        self.assertEqual(batch.shape, (n, config.num_leds, 3))
+        self.assertEqual(batch.dtype, numpy.uint8)
+        for i in range(n):
+            self.assertEqual(batch[i].tobytes(),
+                             encode_pixels(next(reference)), f'frame {i}')
+        # the batch advances the config like calling next n times
+        self.assertEqual(encode_pixels(next(config)),
+                         encode_pixels(next(reference)))
+
+    def test_static(self):
+        self.assertBatchMatches(SolidColor('#123456', num_leds=5), 3)
+        self.assertBatchMatches(Stripes(['#FF0000', '#00FF00'], 2,
+                                        num_leds=7), 4)
+
+    def test_fade(self):
+        fade = Fade(['#FF0000', '#00FF80', '#0000FF'], num_leds=4)
+        self.assertBatchMatches(fade, 200)
+
+    def test_scroll(self):
+        self.assertBatchMatches(Scroll(['#FF0000', '#00FF00', '#0000FF'],
+                                       num_leds=10), 25)
+        self.assertBatchMatches(Scroll(['#FF0000'], num_leds=0), 3)
+
+    def test_strobe(self):
+        self.assertBatchMatches(Strobe(Scroll(['#FF0000', '#0000FF'],
+                                              num_leds=5), strobe_speed=3), 12)
+        self.assertBatchMatches(Strobe(SolidColor('#FF0000', num_leds=5)), 5)
+
+    def test_default(self):
+        strobe = Strobe(Scroll(['#FF0000', '#0000FF'], num_leds=4))
+        strobe._config.seekable = False  # force rendering in order
+        self.assertBatchMatches(strobe, 6)
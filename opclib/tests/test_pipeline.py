@@ -0,0 +1,106 @@
+import threading
+import unittest
+
+from opclib.interface import DynamicLightConfig
+from opclib.pipeline import FrameQueue
+from opclib.tests.test_timing import FakeClock
+from opclib.timing import FrameClock
+
+
+class Counter(DynamicLightConfig):
+    """
+    A configuration which shows a single pixel counting up, then stops.
+    """
+    speed = 100
+
+    def __init__(self, stop, **kwargs):
+        super().__init__(num_leds=1, **kwargs)
+        self.count = 0
+        self.stop = stop
+
+    def __next__(self):
+        if self.count == self.stop:
+            raise StopIteration
+        self.count += 1
+        return [(self.count, 0, 0)]
+
+
+class RecordingClient:
+    """
+    A stand-in for ``opc.Client`` which remembers what it was sent.
+    """
+
+    def __init__(self):
+        self.frames = []
+
+    def put_pixels(self, pixels, channel=0):
+        self.frames.append(pixels)
+        return True
+
+
+class TestFrameQueue(unittest.TestCase):
+    """
+    Tests for ``FrameQueue``.
+    """
+
+    def test_policies(self):
+        with self.assertRaises(ValueError):
+            FrameQueue(policy='fastest')
+
+        oldest = FrameQueue(2, 'drop-oldest')
+        latest = FrameQueue(2, 'latest')
+        for frame in range(4):
+            oldest.put(frame)
+            latest.put(frame)
+
+        self.assertEqual([oldest.get(), oldest.get()], [2, 3])
+        self.assertEqual(oldest.dropped, 2)
+        self.assertEqual(latest.get(), 3)
+        self.assertEqual(latest.dropped, 3)
+        self.assertIsNone(latest.get(timeout=0))
+
+    def test_block(self):
+        queue = FrameQueue(1, 'block')
+        queue.put(1)
+        producer = threading.Thread(target=queue.put, args=(2,))
+        producer.start()
+        self.assertEqual(queue.get(), 1)
+        producer.join(1)
+        self.assertEqual(queue.get(), 2)
+
+        queue.close()
+        self.assertIsNone(queue.get())
+
+
+class TestPipelinedRun(unittest.TestCase):
+    """
+    Tests for ``DynamicLightConfig.run`` in pipelined mode.
+    """
+
+    def fake_clock(self):
+        # only advances when slept on, so no frame is ever late or skipped
+        time = FakeClock()
+        return FrameClock(Counter.speed, clock=time, sleep=time.sleep)
+
+    def test_run(self):
+        client = RecordingClient()
+        Counter(5).run(client=client, pipeline='block', queue_size=1,
+                       clock=self.fake_clock())
+        self.assertEqual(client.frames,
+                         [[(n, 0, 0)] for n in range(1, 6)])
+
+    def test_run_failure(self):
+        class Broken(Counter):
+            def __next__(self):
+                if self.count == 2:
+                    raise RuntimeError('render failed')
+                return super().__next__()
+
+        for pipeline in (None, 'latest'):
+            with self.assertRaisesRegex(RuntimeError, 'render failed'):
+                Broken(5).run(client=RecordingClient(), pipeline=pipeline,
+                              clock=self.fake_clock())
+
+
+if __name__ == '__main__':
+    unittest.main()
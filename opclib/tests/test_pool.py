@@ -0,0 +1,54 @@
+import socket
+import unittest
+
+from opclib.pool import ClientPool
+from opclib.tests.test_opc import ServerTestCase, reference_message
+
+
+class TestClientPool(ServerTestCase):
+    """
+    Tests for ``ClientPool``.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.other = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.other.bind(('127.0.0.1', 0))
+        self.other.listen(1)
+        self.other_address = '127.0.0.1:%d' % self.other.getsockname()[1]
+
+    def tearDown(self):
+        self.other.close()
+        super().tearDown()
+
+    def test_put_pixels(self):
+        pixels = [(1, 2, 3), (4, 5, 6), (7, 8, 9)]
+        pool = ClientPool({self.address: (0, 2),
+                           self.other_address: (2, 3)})
+        self.assertTrue(pool.put_pixels(pixels, channel=1))
+        pool.wait()
+
+        expected = reference_message(pixels[:2], 1)
+        self.assertEqual(self.receive(len(expected)), expected)
+
+        conn, _ = self.other.accept()
+        with conn:
+            expected = reference_message(pixels[2:], 1)
+            self.assertEqual(conn.recv(len(expected)), expected)
+
+        self.assertEqual([node.sent for node in pool.nodes], [1, 1])
+        pool.close()
+
+    def test_failure(self):
+        self.other.close()
+        pool = ClientPool([self.address, self.other_address])
+        pool.put_pixels([(1, 2, 3)])
+        pool.wait()
+
+        self.assertEqual([(node.sent, node.failed) for node in pool.nodes],
+                         [(1, 0), (0, 1)])
+        pool.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+
+from opclib.patterns import Playback, Scroll, SolidColor
+from opclib.patterns.modifiers import Strobe
+from opclib.recording import record
+
+
+class TestRecording(unittest.TestCase):
+    """
+    Tests for ``record`` and the ``Playback`` pattern.
+    """
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp()
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_playback(self):
+        scroll = Scroll(['#C8C8C8', '#000000', '#646464'], num_leds=3)
+        self.assertEqual(record(scroll, self.path, 4), 4)
+
+        playback = Playback(self.path)
+        self.assertEqual((playback.num_leds, playback.speed), (3, scroll.speed))
+        self.assertIsNone(playback.period)
+        for index in range(1, 5):
+            self.assertEqual(next(playback), scroll.render_frame(index))
+        self.assertRaises(StopIteration, next, playback)
+
+        frame = playback.render_frame(2)
+        self.assertIs(frame.message(), frame.message())  # sent from the file
+        self.assertEqual(bytes(frame.message(channel=5))[:1], b'\x05')
+        with self.assertRaises(TypeError):
+            frame[0] = (0, 0, 0)
+        del frame
+        playback.close()
+        self.assertEqual(Playback(self.path, loop=True).render_frame(6),
+                         scroll.render_frame(2))
+
+    def test_record(self):
+        strobe = Strobe(SolidColor('#646464', num_leds=2))
+        expected = [list(next(strobe)) for _ in range(3)]
+        strobe.frame_index = 0
+        self.assertEqual(record(strobe, self.path, 3, speed=30), 3)
+
+        playback = Playback(self.path, loop=True)
+        self.assertEqual(playback.speed, 30)
+        self.assertEqual(playback.period, 3)
+        self.assertEqual([list(next(playback)) for _ in range(4)],
+                         expected + expected[:1])
+
+    def test_bad_recording(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'not a recording at all')
+        self.assertRaises(ValueError, Playback, self.path)
+
+        record(SolidColor('#646464', num_leds=2), self.path, 2)
+        self.assertRaises(ValueError, Playback, self.path, num_leds=3)
+        with open(self.path, 'r+b') as f:
+            f.truncate(os.path.getsize(self.path) - 1)
+        self.assertRaises(ValueError, Playback, self.path)
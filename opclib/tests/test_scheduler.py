@@ -0,0 +1,73 @@
+import unittest
+
+from opclib.opc import AsyncClient
+from opclib.patterns import Scroll, SolidColor
+from opclib.scheduler import Scheduler
+from opclib.tests.test_timing import FakeClock
+
+
+class RecordingClient:
+    """
+    A stand-in for ``opc.Client`` which remembers when it was sent frames.
+    """
+
+    def __init__(self, time):
+        self.time = time
+        self.sent = []
+
+    def put_pixels(self, pixels, channel=0):
+        self.sent.append((round(self.time.now - 100, 6), channel))
+        return True
+
+
+class TestScheduler(unittest.TestCase):
+    """
+    Tests for ``Scheduler``.
+    """
+
+    def setUp(self):
+        self.time = FakeClock()
+        self.scheduler = Scheduler(clock=self.time, sleep=self.time.sleep)
+        self.client = RecordingClient(self.time)
+
+    def test_rates(self):
+        fast = self.scheduler.add(Scroll(['#FF0000'], num_leds=1, speed=4),
+                                  self.client, 1)
+        self.scheduler.add(Scroll(['#FF0000'], num_leds=1), self.client, 2,
+                           rate=2)
+        static = self.scheduler.add(SolidColor('#FF0000', num_leds=1),
+                                    self.client, 3)
+        self.scheduler.run(duration=1)
+
+        self.assertEqual(sorted(self.client.sent),
+                         [(0, 1), (0, 2), (0, 3), (0.25, 1), (0.5, 1),
+                          (0.5, 2), (0.75, 1), (1, 1), (1, 2)])
+        self.assertEqual(fast.frames, 5)
+        self.assertFalse(static.active)
+        self.assertEqual(len(self.scheduler.outputs), 2)
+
+    def test_skip(self):
+        scroll = Scroll(['#FF0000', '#00FF00', '#0000FF'], num_leds=3,
+                        speed=10)
+        output = self.scheduler.add(scroll, self.client)
+        self.assertEqual(self.scheduler.step(), 1)
+        self.assertEqual(self.scheduler.step(), 0)  # not due yet
+
+        self.time.now += 0.35  # three frames due, two get skipped
+        self.assertEqual(self.scheduler.step(), 1)
+        self.assertEqual((output.skipped, scroll.frame_index), (2, 4))
+        self.assertAlmostEqual(self.scheduler.next_deadline(), 100.4)
+
+    def test_async_client(self):
+        with self.assertRaisesRegex(TypeError, 'coroutine'):
+            self.scheduler.add(SolidColor('#FF0000', num_leds=1),
+                               AsyncClient('localhost:7890'))
+        self.assertEqual(self.scheduler.outputs, [])
+
+    def test_remove(self):
+        output = self.scheduler.add(Scroll(['#FF0000'], num_leds=1),
+                                    self.client)
+        self.scheduler.remove(output)
+        self.assertIsNone(self.scheduler.next_deadline())
+        self.scheduler.run()  # returns at once with nothing to drive
+        self.assertEqual(self.client.sent, [])
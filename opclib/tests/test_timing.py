@@ -0,0 +1,52 @@
+import unittest
+
+from opclib.timing import FrameClock
+
+
+class FakeClock:
+    """
+    A clock which only advances when slept on or told to.
+    """
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TestFrameClock(unittest.TestCase):
+    """
+    Tests for ``FrameClock``.
+    """
+
+    def test_tick(self):
+        time = FakeClock()
+        clock = FrameClock(10, clock=time, sleep=time.sleep)
+
+        for _ in range(5):
+            self.assertEqual(clock.tick(), 0)
+            time.now += 0.03  # rendering does not delay the next deadline
+        self.assertAlmostEqual(time.now, 100.43)
+        self.assertAlmostEqual(clock.fps, 10)
+        self.assertAlmostEqual(clock.jitter, 0)
+
+    def test_skip(self):
+        time = FakeClock()
+        clock = FrameClock(10, clock=time, sleep=time.sleep)
+
+        clock.tick()
+        time.now += 0.35  # missed the deadlines at 0.1 and 0.2 seconds
+        self.assertEqual(clock.tick(), 2)
+        self.assertEqual(clock.skipped, 2)
+
+        # back on schedule: the next deadline is at 0.4 seconds
+        self.assertEqual(clock.tick(), 0)
+        self.assertAlmostEqual(time.now, 100.4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+"""
+Module for frame timing. A :class:`~FrameClock` paces a render loop against
+absolute deadlines on a monotonic clock, so the time spent rendering and
+sending a frame does not slow the animation down.
+"""
+
+import time
+
+from typing import Callable
+
+__all__ = ['FrameClock']
+
+
+class FrameClock:
+    """
+    Schedule frames at a fixed rate using absolute deadlines.
+
+    Each call to :meth:`tick` waits for the next deadline. Deadlines are spaced
+    exactly ``1 / rate`` seconds apart regardless of how long the caller took
+    between ticks, so the achieved rate does not drift. When the caller falls
+    more than a whole frame behind, the missed deadlines are skipped rather
+    than rushed through, and :meth:`tick` reports how many were skipped so the
+    caller can coalesce them.
+    """
+    rate: float  # target frames per second
+    frames: int = 0  # number of ticks so far
+    skipped: int = 0  # number of deadlines skipped so far
+
+    _smoothing = 0.1  # weight of the newest sample in the running averages
+
+    def __init__(self, rate: float,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Initialize a new :class:`~FrameClock`. The first deadline is the
+        moment of the first call to :meth:`tick`.
+
+        :param rate: the target number of frames per second
+        :param clock: a monotonic clock returning seconds
+        :param sleep: a function which sleeps for the given number of seconds
+        """
+        self.rate = rate
+        self._clock = clock
+        self._sleep = sleep
+
+        self._deadline = None
+        self._last_tick = None
+        self._interval = 1 / rate  # running average time between ticks
+        self._lateness = 0.0  # running average of lateness
+
+    @property
+    def fps(self) -> float:
+        """
+        The achieved number of frames per second, averaged over recent frames.
+        """
+        return 1 / self._interval if self._interval else 0.0
+
+    @property
+    def jitter(self) -> float:
+        """
+        How late frames start after their deadlines, averaged over recent
+        frames (seconds).
+        """
+        return self._lateness
+
+    def tick(self) -> int:
+        """
+        Wait until the next frame is due.
+
+        :return: the number of frames which were skipped because the caller
+            fell behind
+        """
+        period = 1 / self.rate
+        now = self._clock()
+        if self._deadline is None:
+            self._deadline = now
+        elif now < self._deadline:
+            self._sleep(self._deadline - now)
+            now = self._clock()
+
+        lateness = now - self._deadline
+        missed = int(lateness / period)  # whole frames behind
+        self._deadline += (missed + 1) * period
+
+        if self._last_tick is not None:
+            self._interval += self._smoothing * (
+                now - self._last_tick - self._interval)
+        self._lateness += self._smoothing * (
+            lateness - missed * period - self._lateness)
+        self._last_tick = now
+
+        self.frames += 1
+        self.skipped += missed
+        return missed
@@ -17,6 +17,9 @@ setup(
     package_data={'opclib': ['bin/fcserver*']},
     include_package_data=True,
     zip_safe=False,
+    extras_require={
+        'numpy': ['numpy'],  # faster frame encoding
+    },
     # python_requires='>=3.7',  # TODO: Test other Python versions
     classifiers=[
         'Development Status :: 3 - Alpha',